@@ -1,24 +1,55 @@
 from __future__ import annotations
-import os, csv, time, json, base64, logging, re
+import os, csv, time, json, base64, logging, re, asyncio, hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List
-
-import dotenv, pandas as pd
+from typing import Any, Dict, List, Tuple
+
+import dotenv
+from PIL import Image
+try:                                    # optional – OCR-first routing for section crops
+    import pytesseract
+except ImportError:
+    pytesseract = None
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException, NoSuchElementException, WebDriverException
 )
 
+from openai_common import cache_get, cache_put, openai_client
+from scraper_common import (
+    BatchQueue, fill_csv, load_done, open_output, polite_pause, profile_slug, quit_drivers, resolved, run_async, run_workers,
+    start_worker, wait, worker_driver,
+)
+
 dotenv.load_dotenv()
 
 # ───────────────────────────── config ────────────────────────────────────
 IN_CSV   = Path("output/alumni_linkedin_urls_FOUND.csv")
 OUT_CSV  = Path("output/alumni_linkedin_details.csv")
+DONE_TXT = OUT_CSV.with_suffix(".done.txt")   # append‑only resume set, one profile_slug per line
 SHOTDIR  = Path("screenshots")
+PROFILE_DIR = Path("chrome_profile")  # persisted Chrome sessions, one sub‑dir per worker
+COOKIES     = PROFILE_DIR / "cookies.pkl"  # session of the last real login, shared by workers
+VISION_MODE = os.getenv("VISION_MODE", "live")   # "batch" → Batch API: half price, answers within 24 h
+
+VISION_MAX_SIDE = 2048      # GPT‑4o tiles anything larger down to this anyway
+VISION_MIN_SIDE = 768       # … and then shrinks the short side to this
+VISION_LOW_SIDE = 512       # detail="low" sees a single 512‑px image
+VISION_JPEG_Q   = 75
+VISION_DETAIL   = {"header": "low"}   # short, large‑type card; sections default to "auto"
+OCR_MIN_CHARS   = 200       # below this the crop is not worth a text-only call
+OCR_MIN_CONF    = 80        # mean Tesseract word confidence needed to trust OCR
+
+# avatars, logos, fonts, video & trackers – nothing the scrape needs; the
+# profile_pic URL is read from the <img src> attribute, not the bitmap
+BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.woff*", "*.mp4",
+    "*google-analytics*", "*doubleclick*",
+]
 
 WAIT_HEAD    = 20
 HEAD_CSS     = (
@@ -27,19 +58,21 @@ HEAD_CSS     = (
     "section.pv-top-card",
 )
 WAIT_MODAL   = 12
-PAUSE_SCROLL = 0.35
-
-SECTION_REGEX = {
-    "experience": re.compile(r"^experience", re.I),
-    "education" : re.compile(r"^education",  re.I),
-    "licenses"  : re.compile(r"^licenses? &", re.I),
-    "volunteering": re.compile(r"^volunteer", re.I),
-}
+WAIT_GROW    = 2            # max wait for lazy sections to extend the page
+WORKERS      = int(os.getenv("SCRAPER_WORKERS", "4"))   # parallel Chrome sessions – keep ≤ 8
+HEADLESS     = os.getenv("SCRAPER_HEADLESS", "1") != "0"   # 0 → visible windows for debugging
+
+# one alternation for every <h2>; the matching group's name is the section key
+SECTION_RE = re.compile(
+    r"^(?:(?P<experience>experience)|(?P<education>education)"
+    r"|(?P<licenses>licenses? &)|(?P<volunteering>volunteer))",
+    re.I,
+)
 
 PROMPTS: Dict[str, str] = {
     # prompt texts kept minimal to save tokens
     "header": (
-        "Return ONLY the following JSON (no markdown):\n"
+        "Return ONLY the following JSON:\n"
         '{ "current_title":"", "current_company":"", "second_title":"", "second_company":"", '
         '  "third_title":"", "third_company":"", "location":"", "connections":"", "headline":"" }'
     ),
@@ -62,252 +95,566 @@ logging.getLogger("selenium").setLevel(logging.WARNING)
 OPENAI_KEY = os.getenv("OPENAI_API_KEY") or input("OpenAI key (blank to skip Vision): ").strip()
 USE_VISION = bool(OPENAI_KEY)
 if USE_VISION:
-    from openai import OpenAI
-    oaclient = OpenAI(api_key=OPENAI_KEY)
-
-def call_vision(img: Path, prompt: str) -> Dict[str, Any]:
+    aoaclient = openai_client(OPENAI_KEY)
+
+
+# Keyed by (prompt, exact screenshot pixels): identical sections (e.g. empty
+# "Licenses") never hit the API twice either.
+def _cache_key(img: Image.Image, prompt: str) -> str:
+    h = hashlib.sha256(f"{img.mode}{img.size}".encode())
+    h.update(img.tobytes())
+    return f"{hashlib.sha1(prompt.encode()).hexdigest()[:8]}_{h.hexdigest()}"
+
+
+def _to_jpeg(img: Image.Image, detail: str = "auto") -> bytes:
+    """Downscale exactly as the API would and re‑encode as JPEG – far smaller upload than PNG."""
+    im = img.convert("RGB")                   # always a copy – the crop stays untouched
+    if detail == "low":
+        im.thumbnail((VISION_LOW_SIDE, VISION_LOW_SIDE), Image.LANCZOS)
+    else:
+        im.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.LANCZOS)
+        if min(im.size) > VISION_MIN_SIDE:
+            f = VISION_MIN_SIDE / min(im.size)
+            im = im.resize((round(im.width * f), round(im.height * f)), Image.LANCZOS)
+    buf = BytesIO()
+    im.save(buf, "JPEG", quality=VISION_JPEG_Q, optimize=True)
+    return buf.getvalue()
+
+
+def _ocr_text(img: Image.Image) -> str:
+    """Return the crop's text when Tesseract reads it confidently, else ''."""
+    if pytesseract is None:
+        return ""
+    try:
+        d = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+    except Exception as e:                      # tesseract binary missing, bad image …
+        logging.debug(f"OCR unavailable – {e}")
+        return ""
+    lines: Dict[Tuple[int, int, int], List[str]] = {}
+    confs: List[float] = []
+    for i, word in enumerate(d["text"]):
+        if word.strip() and float(d["conf"][i]) >= 0:
+            lines.setdefault((d["block_num"][i], d["par_num"][i], d["line_num"][i]), []).append(word)
+            confs.append(float(d["conf"][i]))
+    text = "\n".join(" ".join(words) for words in lines.values())
+    chars = [c for c in text if not c.isspace()]
+    if (
+        len(text) < OCR_MIN_CHARS
+        or sum(confs) / len(confs) < OCR_MIN_CONF
+        or sum(c.isalnum() for c in chars) / len(chars) < 0.7
+    ):
+        return ""
+    return text
+
+
+def _vision_body(img: Image.Image, prompt: str, detail: str, text: str = "") -> Dict[str, Any]:
+    """chat.completions payload – text‑only when OCR *text* is given, else the image."""
+    if text:
+        # clean OCR → a plain text call costs a fraction of the image tokens
+        messages = [{"role": "user", "content": f"{prompt}\n\n{text}"}]
+    else:
+        b64 = base64.b64encode(_to_jpeg(img, detail)).decode()
+        messages = [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {"type": "image_url", "image_url": {
+                    "url": f"data:image/jpeg;base64,{b64}", "detail": detail,
+                }},
+            ],
+        }]
+    return {
+        "model": "gpt-4o-mini",
+        "messages": messages,
+        "response_format": {"type": "json_object"},
+        "max_tokens": 900,
+        "temperature": 0,
+    }
+
+
+async def call_vision(
+    img: Image.Image, prompt: str, detail: str = "auto", ocr: bool = False
+) -> Dict[str, Any]:
     """Send image screenshot + prompt to GPT‑4o‑mini Vision and return a dict."""
     if not USE_VISION:
         logging.debug("Vision disabled → returning empty dict.")
         return {}
+    # hashing the pixels and the Pillow resize/JPEG encode are CPU work – keep
+    # them off the shared loop so other profiles' requests keep flowing
+    key = await asyncio.to_thread(_cache_key, img, prompt)
+    if (hit := cache_get(key)) is not None:
+        logging.debug(f"Vision cache hit ({key[:16]})")
+        return hit
     try:
-        b64 = base64.b64encode(img.read_bytes()).decode()
-        rsp = oaclient.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{b64}"}},
-                ],
-            }],
-            max_tokens=900,
-            temperature=0,
-        )
-        content = rsp.choices[0].message.content
+        text = await asyncio.to_thread(_ocr_text, img) if ocr else ""
+        body = await asyncio.to_thread(_vision_body, img, prompt, detail, text)
+        rsp = await aoaclient.chat.completions.create(**body)
+        result = json.loads(rsp.choices[0].message.content)
+    except Exception as e:
+        logging.error(f"Vision failed – {e}")
+        return {}
+    cache_put(key, result)
+    return result
 
-        # ── attempt direct parse ──
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            pass
 
-        # ── strip common code-block fences ──
-        cleaned = content.strip()
-        if cleaned.startswith("```"):
-            # remove leading and trailing ``` with optional "json"
-            cleaned = re.sub(r"^```[a-zA-Z]*", "", cleaned)
-            cleaned = re.sub(r"```$", "", cleaned).strip()
+async def _vision_gather(jobs: List[Tuple[Image.Image, str, str, bool]]) -> List[Dict[str, Any]]:
+    return await asyncio.gather(*(call_vision(*job) for job in jobs))
+
+
+def submit_vision(jobs: List[Tuple[Image.Image, str, str, bool]]) -> Future:
+    """Start every (image, prompt, detail, ocr) job concurrently without blocking.
+
+    ``.result()`` on the returned future gives the payloads in input order.
+    """
+    if not jobs:
+        return resolved([])
+    return run_async(_vision_gather(jobs))
+
+# ─────────────────── OpenAI Batch API (VISION_MODE=batch) ────────────────
+BATCH = BatchQueue(Path("cache/batch_queue.jsonl"), Path("cache/batch_sent.txt"))
+
+
+def queue_batch(batch_id: str, names: List[str], jobs: List[Tuple[Image.Image, str, str, bool]]) -> Future:
+    """Batch‑mode twin of :func:`submit_vision` – cache hits now, {} for every queued job."""
+    if not USE_VISION:
+        return resolved([{} for _ in jobs])
+    out, requests = [], []
+    for name, (img, prompt, detail, ocr) in zip(names, jobs):
+        key = _cache_key(img, prompt)
+        if (hit := cache_get(key)) is not None:
+            out.append(hit)
+            continue
+        out.append({})
+        text = _ocr_text(img) if ocr else ""
+        requests.append((f"{batch_id}|{name}|{key}", _vision_body(img, prompt, detail, text)))
+    BATCH.add(requests)
+    return resolved(out)
 
-        # direct try again
+
+def apply_batch() -> None:
+    """Run the queued Batch jobs and fill the still‑empty Vision columns of OUT_CSV."""
+    if not USE_VISION or not BATCH.pending():
+        return
+    merged: Dict[str, Dict[str, Any]] = {}
+    for cid, payload in BATCH.results(aoaclient):
+        slug, sec_name, key = cid.split("|")
+        cache_put(key, payload)
         try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
-            # ── fallback: grab first {...} blob ──
-            m = re.search(r"{.*}", cleaned, flags=re.S)
-            if m:
-                try:
-                    return json.loads(m.group(0))
-                except json.JSONDecodeError:
-                    pass
-
-        raise ValueError("Unable to parse JSON from vision response")
-    except Exception as e:
-        logging.error(f"Vision parse error – {e}")
-        return {}
+            merge_payload(merged.setdefault(slug, {}), sec_name, payload)
+        except Exception as e:
+            logging.warning(f"{slug} {sec_name} merge failed – {e}")
+    fill_csv(OUT_CSV, merged)
+    BATCH.merged()
+    logging.info(f"✓ Batch results merged for {len(merged)} profiles")
 
 # ───────────────────────── Selenium helpers ─────────────────────────────
 
-def init_driver() -> webdriver.Chrome:
+def init_driver(headless: bool = False, profile_dir: Path | None = None) -> webdriver.Chrome:
     opts = Options()
     opts.add_argument("--start-maximized")
     opts.add_argument("--disable-notifications")
-    return webdriver.Chrome(options=opts)
-
+    if profile_dir is not None:
+        opts.add_argument(f"--user-data-dir={profile_dir.resolve()}")
+    if headless:
+        opts.add_argument("--headless=new")
+        opts.add_argument("--window-size=1920,1080")
+        opts.add_argument("--disable-gpu")
+        opts.add_argument("--no-sandbox")
+        opts.add_argument("--disable-dev-shm-usage")
+    opts.page_load_strategy = "eager"
+    # keep_alive → all WebDriver commands reuse one pooled socket to chromedriver
+    drv = webdriver.Chrome(options=opts, keep_alive=True)
+    drv.execute_cdp_cmd("Network.enable", {})
+    drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    return drv
 
-def linkedin_login(drv: webdriver.Chrome, email: str, pwd: str) -> None:
-    drv.get("https://www.linkedin.com/login")
-    WebDriverWait(drv, 20).until(EC.presence_of_element_located((By.ID, "username")))
-    drv.find_element(By.ID, "username").send_keys(email)
-    drv.find_element(By.ID, "password").send_keys(pwd)
-    drv.find_element(By.XPATH, "//button[@type='submit']").click()
-    WebDriverWait(drv, 20).until(
-        EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder,'Search')]"))
-    )
-    logging.info("✔ Logged in.")
 
 # ─────────────── scrolling & loading helpers ────────────────────────────
 
 def _scroll_into(drv: webdriver.Chrome, elem) -> None:
     drv.execute_script("arguments[0].scrollIntoView({block:'center'})", elem)
-    time.sleep(0.3)
+    try:
+        wait(drv, 1).until(EC.visibility_of(elem))
+    except TimeoutException:
+        pass
+
+
+# Runs entirely in the page: render everything, jump to the bottom, and jump
+# again whenever lazy content extends it. Calls back once the height has been
+# stable for WAIT_GROW seconds with no loader spinning – one round‑trip total.
+RENDER_JS = """
+const growMs = arguments[0], done = arguments[arguments.length - 1];
+document.querySelectorAll('.scaffold-finite-scroll, [data-section], section')
+  .forEach(e => { e.style.contentVisibility = 'visible'; });
+let h = -1, since = Date.now();
+const id = setInterval(() => {
+  const cur = document.body.scrollHeight;
+  if (cur !== h) {
+    h = cur; since = Date.now();
+    window.scrollTo(0, cur);
+  } else if (Date.now() - since >= growMs
+             && document.readyState === 'complete'
+             && !document.querySelector('.artdeco-loader')) {
+    clearInterval(id);
+    done(cur);
+  }
+}, 50);
+"""
+
+
+# header card + every <section> with its <h2> text – elements come back as WebElements
+BLOCKS_JS = """
+const head = arguments[0].map(sel => document.querySelector(sel)).find(Boolean) || null;
+const secs = Array.from(document.querySelectorAll('section h2'))
+  .map(h => [h.innerText.trim(), h.closest('section')]);
+return {header: head, sections: secs};
+"""
+
+
+def find_blocks(drv: webdriver.Chrome) -> Tuple[Any, Dict[str, Any]]:
+    """(header element | None, {section name: <section>}) in one round‑trip."""
+    res = drv.execute_script(BLOCKS_JS, list(HEAD_CSS))
+    blocks: Dict[str, Any] = {}
+    for text, elem in res["sections"]:
+        if m := SECTION_RE.match(text):
+            blocks.setdefault(m.lastgroup, elem)
+    return res["header"], blocks
 
 
 def ensure_sections_loaded(drv: webdriver.Chrome) -> None:
-    """Fast‑scroll page so that lazy‑loaded items for every desired section are rendered."""
-    for h in drv.find_elements(By.CSS_SELECTOR, "section h2"):
-        if any(pat.match(h.text.strip()) for pat in SECTION_REGEX.values()):
-            _scroll_into(drv, h)
-
-    last = 0
-    while True:
-        drv.execute_script("window.scrollBy(0, 600);")
-        time.sleep(PAUSE_SCROLL)
-        seen = drv.execute_script("return window.pageYOffset + window.innerHeight;")
-        total = drv.execute_script("return document.body.scrollHeight;")
-        if seen >= total or seen == last:
-            break
-        last = seen
+    """Force lazy sections to render with one in‑page scroller instead of polling from Python."""
+    try:
+        drv.execute_async_script(RENDER_JS, int(WAIT_GROW * 1000))
+    except TimeoutException:
+        logging.debug("Page still growing at script timeout – continuing anyway.")
+
+    for elem in find_blocks(drv)[1].values():
+        _scroll_into(drv, elem)
     logging.debug("All sections loaded.")
 
-# ───────────────────── DOM bits (pic & email) ───────────────────────────
+# ───────────────────── DOM bits (header, pic & email) ───────────────────
+
+# header fields that are plain text in the top card – Vision is only a fallback
+HEADER_KEYS = ("current_title", "current_company", "location", "connections", "headline")
+
+
+# one round‑trip to chromedriver instead of one per field
+DOM_JS = """
+const txt = (root, sel) => {
+  const el = root && root.querySelector(sel);
+  return el ? el.innerText.trim() : '';
+};
+const pic = document.querySelector(
+  "img.pv-top-card-profile-picture__image, img.profile-photo-edit__preview, " +
+  "img[id^='ember'][class*='profile']");
+const anchor = document.getElementById('experience');
+const sec = anchor && anchor.closest('section');
+const job = sec && sec.querySelector('li');
+return {
+  profile_pic:     pic ? pic.src : '',
+  headline:        txt(document, 'div.text-body-medium.break-words'),
+  location:        txt(document, 'span.text-body-small.inline.t-black--light.break-words'),
+  connections:     txt(document, "a[href*='connections'] span.t-bold")
+                   || txt(document, 'li.text-body-small span.t-bold'),
+  current_title:   txt(job, "span[aria-hidden='true']"),
+  current_company: txt(job, "span.t-14.t-normal span[aria-hidden='true']").split(' · ')[0].trim(),
+  has_contact:     !!document.getElementById('top-card-text-details-contact-info'),
+};
+"""
+
+
+def grab_dom_bits(drv: webdriver.Chrome) -> Dict[str, Any]:
+    """Header fields, profile picture and contact‑link presence in one call."""
+    out = {"profile_pic": "", **{k: "" for k in HEADER_KEYS}, "has_contact": False}
+    out.update(drv.execute_script(DOM_JS) or {})
+    return out
 
-def grab_dom_bits(drv: webdriver.Chrome, extract_contact_info: bool) -> Dict[str, str]:
-    out = {"profile_pic": "", "email": ""}
 
-    # ▸ profile picture
-    for sel in (
-        "img.pv-top-card-profile-picture__image",
-        "img.profile-photo-edit__preview",
-        "img[id^='ember'][class*='profile']",
-    ):
-        try:
-            out["profile_pic"] = drv.find_element(By.CSS_SELECTOR, sel).get_attribute("src")
-            break
-        except NoSuchElementException:
+# every top‑level entry of a section → its visible texts; "sub" holds the
+# nested entries (several roles at one company, skills lines …)
+SECTION_ITEMS_JS = """
+const spans = li => Array.from(li.querySelectorAll("span[aria-hidden='true']"))
+  .filter(s => s.closest('li') === li)
+  .map(s => s.innerText.trim()).filter(Boolean);
+return Array.from(arguments[0].querySelectorAll('li'))
+  .filter(li => !li.parentElement.closest('li'))
+  .map(li => ({
+    spans: spans(li),
+    sub: Array.from(li.querySelectorAll('li')).map(spans).filter(a => a.length),
+  }));
+"""
+DATE_RE = re.compile(r"\b(?:19|20)\d{2}\b|\bpresent\b", re.I)
+NDU_RE  = re.compile(r"national defen[cs]e university|\bndu\b", re.I)
+
+
+def _role(title: str, company: str, dates: str) -> str:
+    """'Title @ Company – Dates' – the shape merge_payload splits on."""
+    role = f"{title} @ {company.split(' · ')[0].strip()}"
+    return f"{role} – {dates.split(' · ')[0].strip()}" if dates else role
+
+
+def section_items(drv: webdriver.Chrome, section_elem, sec_name: str) -> List[str]:
+    """Top‑3 entries of a section straight from the DOM ([] → caller falls back to Vision)."""
+    out: List[str] = []
+    for it in drv.execute_script(SECTION_ITEMS_JS, section_elem) or []:
+        own, sub = it["spans"], it["sub"]
+        if not own:
             continue
-
-    # ▸ e‑mail via contact modal
-    if extract_contact_info:
+        if sec_name == "experience":
+            grouped = [s for s in sub if any(DATE_RE.search(t) for t in s[1:])]
+            if grouped:                           # company header + one entry per role
+                for s in grouped:
+                    out.append(_role(s[0], own[0], next(t for t in s[1:] if DATE_RE.search(t))))
+            elif len(own) >= 2:
+                out.append(_role(own[0], own[1], next((t for t in own[2:] if DATE_RE.search(t)), "")))
+        elif sec_name == "education":
+            if not NDU_RE.search(own[0]):
+                out.append(own[0])
+        elif sec_name == "volunteering" and len(own) >= 2:
+            out.append(f"{own[0]} @ {own[1]}")
+        else:
+            out.append(own[0])
+    return out[:3]
+
+
+def grab_email(drv: webdriver.Chrome) -> str:
+    """E‑mail via the contact‑info modal ('' when absent)."""
+    email = ""
+    try:
+        drv.execute_script("window.scrollTo(0,0);")
+        drv.execute_script("window.scrollBy(0,32);")
+        link = drv.find_element(By.ID, "top-card-text-details-contact-info")
         try:
-            drv.execute_script("window.scrollTo(0,0);")
-            drv.execute_script("window.scrollBy(0,32);")
-            link = drv.find_element(By.ID, "top-card-text-details-contact-info")
-            try:
-                link.click()
-            except WebDriverException:
-                drv.execute_script("arguments[0].click();", link)
-            WebDriverWait(drv, WAIT_MODAL).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "section.artdeco-modal"))
-            )
-            try:
-                mail = drv.find_element(By.CSS_SELECTOR, "a[href^='mailto:']")
-                out["email"] = mail.get_attribute("href").replace("mailto:", "")
-            except NoSuchElementException:
-                pass
-            drv.find_element(By.CSS_SELECTOR, "button[aria-label='Dismiss']").click()
+            link.click()
+        except WebDriverException:
+            drv.execute_script("arguments[0].click();", link)
+        wait(drv, WAIT_MODAL).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "section.artdeco-modal"))
+        )
+        try:
+            mail = drv.find_element(By.CSS_SELECTOR, "a[href^='mailto:']")
+            email = mail.get_attribute("href").replace("mailto:", "")
         except NoSuchElementException:
-            logging.debug("Contact‑info link not present.")
-
-    return out
+            pass
+        drv.find_element(By.CSS_SELECTOR, "button[aria-label='Dismiss']").click()
+    except NoSuchElementException:
+        logging.debug("Contact‑info link not present.")
+    return email
 
 # ───────────────────── utilities for screenshots ────────────────────────
 
+# debug copies of the crops are written off the scrape path
+io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="shot-io")
+
+_NON_ALNUM = re.compile(r"[^A-Za-z0-9]+")
+
+
 def _slugify(text: str) -> str:
     """Return a filesystem-friendly slug."""
-    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_").lower()
+    return _NON_ALNUM.sub("_", text).strip("_").lower()
 
 
-def screenshot_element(drv: webdriver.Chrome, elem, label: str, person_slug: str = "") -> Path:
-    """Capture a screenshot of a specific DOM element.
+def capture_page(drv: webdriver.Chrome) -> Image.Image:
+    """Rasterize the whole page once via CDP – no window resize, nothing written to disk.
 
-    If *person_slug* is supplied (e.g. "john_doe"), the filename becomes
-    "john_doe_header_<ts>.png" for easier traceability.
+    The PNG is decoded exactly once here; every :func:`crop_element` slices
+    the same pixel buffer instead of re-reading the image.
     """
-    SHOTDIR.mkdir(exist_ok=True)
-    base = f"{person_slug + '_' if person_slug else ''}{label}_{int(time.time()*1000)}.png"
-    path = SHOTDIR / base
-    try:
-        _scroll_into(drv, elem)
-        elem.screenshot(str(path))
-    except Exception:
-        drv.save_screenshot(str(path))  # fallback to full-page
-    return path
+    metrics = drv.execute_cdp_cmd("Page.getLayoutMetrics", {})
+    size = metrics.get("cssContentSize") or metrics["contentSize"]
+    shot = drv.execute_cdp_cmd("Page.captureScreenshot", {
+        "format": "png",
+        "captureBeyondViewport": True,
+        "fromSurface": True,
+        "clip": {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1},
+    })
+    page = Image.open(BytesIO(base64.b64decode(shot["data"])))
+    page.load()                                           # single decode, shared by all crops
+    page.info["css_width"] = size["width"]
+    return page
+
+
+# document-space boxes of several elements in one round-trip
+RECTS_JS = """
+return arguments[0].map(e => {
+  const r = e.getBoundingClientRect();
+  return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+});
+"""
+
+
+def element_rects(drv: webdriver.Chrome, elems: List[Any]) -> List[Dict[str, float]]:
+    """Bounding boxes for *elems* – one execute_script instead of one ``.rect`` per element."""
+    return drv.execute_script(RECTS_JS, elems) if elems else []
+
+
+def crop_element(page: Image.Image, r: Dict[str, float], label: str, person_slug: str = "") -> Image.Image:
+    """Cut the document-space box *r* out of a :func:`capture_page` image.
+
+    The crop stays a PIL image – the only encode is the final JPEG in
+    :func:`_to_jpeg`. With DEBUG logging on, it is also kept in SHOTDIR as
+    "john_doe_header_<ts>.png" for traceability.
+    """
+    scale = page.width / page.info["css_width"]           # devicePixelRatio
+    box = tuple(round(v * scale) for v in (r["x"], r["y"], r["x"] + r["width"], r["y"] + r["height"]))
+    crop = page.crop(box)
+
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        SHOTDIR.mkdir(exist_ok=True)
+        base = f"{person_slug + '_' if person_slug else ''}{label}_{int(time.time()*1000)}.png"
+        io_pool.submit(crop.save, SHOTDIR / base, compress_level=1)
+    return crop
 
 # ───────────────────── profile‑level scrape ─────────────────────────────
 
+def merge_payload(data: Dict[str, Any], sec_name: str, payload: Dict[str, Any]) -> None:
+    """Fold one Vision payload into the profile row (lists → '; '-joined strings)."""
+    # ── special handling for experience: extract top-3 roles ──
+    if sec_name == "experience" and isinstance(payload.get("experience"), list):
+        exp_list = payload["experience"]
+        # Fill title/company fields from first 3 entries
+        for idx, item in enumerate(exp_list[:3]):
+            try:
+                # Expect format "Title @ Company – Dates"
+                title_part, rest = item.split("@", 1)
+                company_part = rest.split("–", 1)[0]
+                title_clean   = title_part.strip()
+                company_clean = company_part.strip()
+                if idx == 0:
+                    data["current_title"]  = title_clean
+                    data["current_company"] = company_clean
+                elif idx == 1:
+                    data["second_title"]  = title_clean
+                    data["second_company"] = company_clean
+                elif idx == 2:
+                    data["third_title"]   = title_clean
+                    data["third_company"]  = company_clean
+            except Exception as parse_err:
+                logging.debug(f"Experience parse failed ({item}) – {parse_err}")
+
+        # store joined list for experience column
+        payload["experience"] = "; ".join(exp_list)
+
+    elif isinstance(payload.get(sec_name), list):
+        # Coerce other list payloads to semicolon-separated string
+        try:
+            payload[sec_name] = "; ".join(
+                str(item) if not isinstance(item, str) else item for item in payload[sec_name]
+            )
+        except Exception as join_err:
+            logging.warning(f"{sec_name} join failed – {join_err}")
+
+    data.update(payload)
+
+
 def scrape_profile(
     drv: webdriver.Chrome,
     extract_contact_info: bool,
     person_slug: str = "",
+    batch_id: str = "",
 ) -> Dict[str, Any]:
     # wait until header visible
-    WebDriverWait(drv, WAIT_HEAD).until(
+    wait(drv, WAIT_HEAD).until(
         lambda d: any(d.find_elements(By.CSS_SELECTOR, sel) for sel in HEAD_CSS)
     )
     ensure_sections_loaded(drv)
 
     data: Dict[str, Any] = {}
+    to_crop: List[Tuple[str, Any]] = []
+
+    # 0️⃣ DOM‑extracted bits (deterministic, preferred over Vision)
+    try:
+        dom = grab_dom_bits(drv)
+    except Exception as e:
+        logging.warning(f"DOM bits failed – {e}")
+        dom = {}
+    has_contact = dom.pop("has_contact", True)
+
+    header_elem, blocks = find_blocks(drv)
+
+    # 1️⃣ header – Vision only when the DOM did not yield every header field
+    if USE_VISION and header_elem is not None and not all(dom.get(k) for k in HEADER_KEYS):
+        to_crop.append(("header", header_elem))
 
-    # 1️⃣ header
-    header_elem = None
-    for sel in HEAD_CSS:
-        if elems := drv.find_elements(By.CSS_SELECTOR, sel):
-            header_elem = elems[0]
-            break
-    if header_elem is not None:
-        shot = screenshot_element(drv, header_elem, "header", person_slug)
-        data.update(call_vision(shot, PROMPTS["header"]))
-
-    # 2️⃣ dynamic sections (exp/edu/lic/vol)
-    for sec_name, regex in SECTION_REGEX.items():
+    # 2️⃣ dynamic sections (exp/edu/lic/vol) – DOM text first, crop only what it misses …
+    for sec_name, section_elem in blocks.items():
         try:
-            h2s = drv.find_elements(By.CSS_SELECTOR, "section h2")
-            target_h = next((h for h in h2s if regex.match(h.text.strip())), None)
-            if not target_h:
+            if items := section_items(drv, section_elem, sec_name):
+                merge_payload(data, sec_name, {sec_name: items})     # no Vision needed
                 continue
-            section_elem = target_h.find_element(By.XPATH, "ancestor::section")
-            shot = screenshot_element(drv, section_elem, sec_name, person_slug)
-            payload = call_vision(shot, PROMPTS[sec_name])
-
-            # ── special handling for experience: extract top-3 roles ──
-            if sec_name == "experience" and isinstance(payload.get("experience"), list):
-                exp_list = payload["experience"]
-                # Fill title/company fields from first 3 entries
-                for idx, item in enumerate(exp_list[:3]):
-                    try:
-                        # Expect format "Title @ Company – Dates"
-                        title_part, rest = item.split("@", 1)
-                        company_part = rest.split("–", 1)[0]
-                        title_clean   = title_part.strip()
-                        company_clean = company_part.strip()
-                        if idx == 0:
-                            data["current_title"]  = title_clean
-                            data["current_company"] = company_clean
-                        elif idx == 1:
-                            data["second_title"]  = title_clean
-                            data["second_company"] = company_clean
-                        elif idx == 2:
-                            data["third_title"]   = title_clean
-                            data["third_company"]  = company_clean
-                    except Exception as parse_err:
-                        logging.debug(f"Experience parse failed ({item}) – {parse_err}")
-
-                # store joined list for experience column
-                payload["experience"] = "; ".join(exp_list)
-
-            elif isinstance(payload.get(sec_name), list):
-                # Coerce other list payloads to semicolon-separated string
-                try:
-                    payload[sec_name] = "; ".join(
-                        str(item) if not isinstance(item, str) else item for item in payload[sec_name]
-                    )
-                except Exception as join_err:
-                    logging.warning(f"{sec_name} join failed – {join_err}")
-
-            data.update(payload)
+            if USE_VISION:
+                to_crop.append((sec_name, section_elem))
         except Exception as e:
             logging.warning(f"{sec_name} capture failed – {e}")
 
-    # 3️⃣ DOM‑extracted bits
-    try:
-        data.update(grab_dom_bits(drv, extract_contact_info))
-    except Exception as e:
-        logging.warning(f"DOM bits failed – {e}")
+    # one JS call for every box still needed, then slice them all from the same page image –
+    # the page is captured only when the DOM left something to crop
+    shots: List[Tuple[str, Image.Image]] = []
+    if to_crop:
+        page = capture_page(drv)
+        try:
+            rects = element_rects(drv, [elem for _, elem in to_crop])
+        except Exception as e:
+            logging.warning(f"Section rects failed – {e}")
+            rects = []
+        shots = [
+            (name, crop_element(page, r, name, person_slug)) for (name, _), r in zip(to_crop, rects)
+        ]
+
+    # … then send all screenshots to Vision at once
+    # header keeps the image call – its layout (photo, badges) confuses OCR
+    jobs = [
+        (shot, PROMPTS[name], VISION_DETAIL.get(name, "auto"), name != "header")
+        for name, shot in shots
+    ]
+    if VISION_MODE == "batch":
+        pending = queue_batch(batch_id, [name for name, _ in shots], jobs)
+    else:
+        pending = submit_vision(jobs)
+
+    # 3️⃣ e‑mail via contact modal while Vision is in flight – skip the click when there is no link
+    if extract_contact_info and has_contact:
+        try:
+            data["email"] = grab_email(drv)
+        except Exception as e:
+            logging.warning(f"Contact info failed – {e}")
+
+    for (sec_name, _), payload in zip(shots, pending.result()):
+        try:
+            merge_payload(data, sec_name, payload)
+        except Exception as e:
+            logging.warning(f"{sec_name} merge failed – {e}")
+
+    data.update({k: v for k, v in dom.items() if v})
 
     logging.info(f"Collected keys → {list(data)}")
     return data
 
+# ───────────────────────────── worker pool ───────────────────────────────
+
+def _worker_init(email: str, pwd: str) -> None:
+    """Pool initializer – every worker thread owns one headless, logged‑in Chrome."""
+    start_worker(
+        lambda i: init_driver(headless=HEADLESS, profile_dir=PROFILE_DIR / f"worker_{i}"),
+        email, pwd, COOKIES,
+    )
+
+
+def scrape_one(r: Dict[str, str], extract_contact_info: bool) -> Dict[str, Any]:
+    """Scrape one input row on the calling worker's driver."""
+    drv = worker_driver()
+    url = r["linkedin_profile"]
+    logging.info(f"⇒ {r['firstname']} {r['lastname']} | {url.split('/')[-1]}")
+    try:
+        drv.get(url)
+        slug = _slugify(f"{r['firstname']}_{r['lastname']}")
+        pdata = scrape_profile(drv, extract_contact_info, person_slug=slug, batch_id=r["profile_slug"])
+    except (TimeoutException, WebDriverException) as e:
+        logging.error(f"⚠ Skipped – {e}")
+        pdata = {}
+    polite_pause()
+    return pdata
+
 # ─────────────────────────────── main ────────────────────────────────────
 
 def main() -> None:
@@ -321,54 +668,49 @@ def main() -> None:
     extract_contact_info_str = input("Try to extract contact info (email)? (y/n): ").strip().lower()
     extract_contact_info_bool = extract_contact_info_str == 'y'
 
-    base = pd.read_csv(IN_CSV)
-    out_cols = list(base.columns) + [
+    with IN_CSV.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    out_cols = list(reader.fieldnames or []) + [
         "current_title","current_company","second_title","second_company",
         "third_title","third_company","location","connections","headline",
         "profile_pic","email","experience","education","licenses","volunteering",
+        "profile_slug",
     ]
 
-    done: set[str] = set()
-    if OUT_CSV.exists():
-        done = set(pd.read_csv(OUT_CSV)["linkedin_profile"].dropna())
-        logging.info(f"Resuming – {len(done)} already done.")
-
-    OUT_CSV.parent.mkdir(exist_ok=True)
-    new_file = not OUT_CSV.exists() or OUT_CSV.stat().st_size == 0
-    fout   = OUT_CSV.open("a", newline="", encoding="utf-8")
-    writer = csv.DictWriter(fout, fieldnames=out_cols)
-    if new_file:
-        writer.writeheader()
+    out_cols, done = load_done(OUT_CSV, DONE_TXT, out_cols)
+
+    todo = []
+    for r in rows:
+        url = r["linkedin_profile"]
+        if url.startswith("http") and profile_slug(url) not in done:
+            r["profile_slug"] = profile_slug(url)
+            done.add(r["profile_slug"])              # also drops duplicate inputs
+            todo.append(r)
+    if not todo:
+        logging.info("Nothing left to scrape.")
+        if VISION_MODE == "batch":
+            apply_batch()                            # jobs from an interrupted run
+        return
 
-    drv = init_driver()
+    writer = open_output(OUT_CSV, DONE_TXT, out_cols)
     try:
-        linkedin_login(drv, email, pwd)
-        time.sleep(2)
-
-        for r in base.itertuples(index=False):
-            url = str(r.linkedin_profile)
-            if not url.startswith("http") or url in done:
-                continue
-
-            logging.info(f"⇒ {r.firstname} {r.lastname} | {url.split('/')[-1]}")
-            try:
-                drv.get(url)
-                slug = _slugify(f"{r.firstname}_{r.lastname}")
-                pdata = scrape_profile(drv, extract_contact_info_bool, person_slug=slug)
-            except (TimeoutException, WebDriverException) as e:
-                logging.error(f"⚠ Skipped – {e}")
-                pdata = {}
-
-            writer.writerow({**r._asdict(), **pdata})
-            fout.flush()
-            done.add(url)
-            logging.debug("Row written & flushed.")
-            time.sleep(1.3)
+        for r, pdata in run_workers(
+            todo,
+            lambda r: scrape_one(r, extract_contact_info_bool),
+            lambda: _worker_init(email, pwd),
+            WORKERS,
+        ):
+            writer.writerow(r, pdata)
 
     finally:
-        drv.quit()
-        fout.close()
-        logging.info(f"✓ Finished – total rows now {len(done)} in {OUT_CSV}")
+        quit_drivers()
+        io_pool.shutdown(wait=True)
+        writer.close()
+        logging.info(f"✓ Finished – {len(done)} profiles tracked in {OUT_CSV}")
+
+    if VISION_MODE == "batch":
+        apply_batch()
 
 if __name__ == "__main__":
     main()
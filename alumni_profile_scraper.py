@@ -1,14 +1,15 @@
 """
 alumni_profile_scraper.py
 -----------------------------------------------
-• Requires alumni_linkedin_urls.csv (urls column MUST be named linkedin_profile)
+• Requires alumni_linkedin_urls_FOUND.csv from count.py (urls column MUST be
+  named linkedin_profile; only real http URLs)
 • Collects: firstname, lastname, program, url, title, company,
             location, connections, headline, profile_pic
 • Saves incrementally to output/alumni_profile_details.csv
 -----------------------------------------------
 """
 
-import os, csv, time, logging
+import os, csv, time, random, logging
 import pandas as pd
 from pathlib import Path
 from selenium import webdriver
@@ -16,25 +17,59 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
 
 SRC_CSV   = "output/alumni_linkedin_urls_FOUND.csv"
 DEST_CSV  = "output/alumni_profile_details.csv"
-PAGE_DELAY = 3         # seconds between profile loads
+PROFILE_DIR = Path("chrome_profile") / "profile_scraper"   # persisted session – login once
+POLL       = 0.25      # explicit-wait poll interval – replaces the fixed post-load sleep
+FLUSH_EVERY = 10       # rows buffered between flush + fsync of DEST_CSV
+HEADLESS   = os.getenv("SCRAPER_HEADLESS", "1") != "0"   # 0 → visible window for debugging
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logging.getLogger("selenium").setLevel(logging.WARNING)
 
 
 # ── helpers ──────────────────────────────────────────────────────────
+def wait(driver: webdriver.Chrome, timeout: float) -> WebDriverWait:
+    """Explicit wait that returns as soon as the condition holds (re-renders ignored)."""
+    return WebDriverWait(driver, timeout, poll_frequency=POLL,
+                         ignored_exceptions=(StaleElementReferenceException,))
+
+
 def init_driver() -> webdriver.Chrome:
     opts = Options()
     opts.add_argument("--start-maximized")
     opts.add_argument("--disable-notifications")
+    if HEADLESS:
+        opts.add_argument("--headless=new")
+        opts.add_argument("--window-size=1920,1080")
+        opts.add_argument("--disable-gpu")
+        opts.add_argument("--no-sandbox")
+        opts.add_argument("--disable-dev-shm-usage")
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    opts.add_argument(f"--user-data-dir={PROFILE_DIR.resolve()}")
+    opts.add_argument("--profile-directory=Default")
+    opts.page_load_strategy = "eager"
     return webdriver.Chrome(options=opts)
 
 
 def linkedin_login(driver: webdriver.Chrome, email: str, pwd: str):
+    # the persisted profile usually still holds a session – then this is a no-op
+    driver.get("https://www.linkedin.com/feed/")
+    try:
+        wait(driver, 3).until(
+            EC.presence_of_element_located((By.XPATH, '//input[contains(@placeholder,"Search")]'))
+        )
+        logging.info("Reusing saved session.")
+        return
+    except TimeoutException:
+        pass
+
     driver.get("https://www.linkedin.com/login")
     WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.ID, "username")))
     driver.find_element(By.ID, "username").send_keys(email)
@@ -60,6 +95,16 @@ def first_or_empty(parent, by, selector):
     except NoSuchElementException:
         return ""
 
+# avatar (first of three selectors) + contact-link presence in one round-trip
+TOP_JS = """
+const pic = ['img.pv-top-card-profile-picture__image', 'img.evi-image', 'img[width="200"][title][src]']
+  .map(s => arguments[0].querySelector(s)).find(e => e && e.src);
+return {
+  profile_pic: pic ? pic.src : '',
+  has_contact: !!document.getElementById('top-card-text-details-contact-info'),
+};
+"""
+
 def grab_profile_data(driver):
     data = {
         "current_title": "",
@@ -73,7 +118,7 @@ def grab_profile_data(driver):
 
     # ---------- top-card block ----------
     try:
-        top = WebDriverWait(driver, 8).until(
+        top = wait(driver, 8).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "div.ph5"))
         )
 
@@ -81,30 +126,27 @@ def grab_profile_data(driver):
         data["location"]    = first_or_empty(top, By.CSS_SELECTOR, "span.text-body-small")
         data["connections"] = first_or_empty(top, By.CSS_SELECTOR, "span.t-black--light")
 
-        # profile picture: try 3 selectors in order
-        for pic_sel in [
-            "img.pv-top-card-profile-picture__image",
-            "img.evi-image",
-            'img[width="200"][title][src]',
-        ]:
-            try:
-                data["profile_pic"] = top.find_element(By.CSS_SELECTOR, pic_sel).get_attribute("src")
-                if data["profile_pic"]:
-                    break
-            except NoSuchElementException:
-                continue
+        top_bits = driver.execute_script(TOP_JS, top) or {}
+        data["profile_pic"] = top_bits.get("profile_pic", "")
+        has_contact = top_bits.get("has_contact", True)
     except TimeoutException:
-        pass  # couldn’t load top card; leave fields empty
+        has_contact = True  # couldn’t load top card; leave fields empty, still try the modal
 
     # ---------- experience section ----------
     try:
-        exp_first = driver.find_element(By.CSS_SELECTOR, "section[id*=experience] li")
+        # experience renders lazily below the top card – wait for it (or give up
+        # quickly on profiles without one) instead of sleeping a fixed delay
+        exp_first = wait(driver, 4).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "section[id*=experience] li"))
+        )
         data["current_title"]   = first_or_empty(exp_first, By.CSS_SELECTOR, "span[aria-hidden='true']")
         data["current_company"] = first_or_empty(exp_first, By.CSS_SELECTOR, "span.t-14.t-normal")
-    except NoSuchElementException:
+    except (TimeoutException, NoSuchElementException):
         pass
 
     # ---------- contact info (email) ----------
+    if not has_contact:
+        return data  # profile simply doesn’t have a contact-info button
     try:
         # Some profiles have no “Contact Info” button; catch that too
         contact_btn = driver.find_element(By.ID, "top-card-text-details-contact-info")
@@ -112,7 +154,7 @@ def grab_profile_data(driver):
 
         # give modal up to 12 s; if it never shows, just skip
         try:
-            WebDriverWait(driver, 12).until(
+            wait(driver, 12).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "section.artdeco-modal"))
             )
 
@@ -146,13 +188,15 @@ def main():
     pwd   = os.getenv("LINKEDIN_PASSWORD") or input("LinkedIn password: ")
 
     src = pd.read_csv(SRC_CSV)
-    src = src[src["linkedin_profile"].str.upper() != "NOT FOUND"].drop_duplicates()
+    src = src.drop_duplicates()              # count.py already kept only http URLs
 
     done_urls: set[str] = set()
     dest = Path(DEST_CSV)
-    if dest.exists():
-        prev = pd.read_csv(dest)
-        done_urls = set(prev["linkedin_profile"])
+    if dest.exists() and dest.stat().st_size:
+        with dest.open(newline="", encoding="utf-8") as f:
+            rd = csv.reader(f)               # one column by index – no full-frame parse
+            i = next(rd).index("linkedin_profile")
+            done_urls = {r[i] for r in rd if len(r) > i and r[i]}
         logging.info(f"Resuming – {len(done_urls)} profiles already scraped")
 
     dest.parent.mkdir(exist_ok=True)
@@ -168,33 +212,41 @@ def main():
     if dest.stat().st_size == 0:
         writer.writeheader()
 
-    driver = init_driver()
-    linkedin_login(driver, email, pwd)
-
-    for row in src.itertuples():
-        url = row.linkedin_profile
-        if url in done_urls:
-            continue
-
-        driver.get(url)
-        time.sleep(PAGE_DELAY)
-
-        pdata = grab_profile_data(driver)
-        writer.writerow(
-            {
-                "firstname": row.firstname,
-                "lastname": row.lastname,
-                "program": row.program,
-                "linkedin_profile": url,
-                **pdata,
-            }
-        )
+    def flush():
         csv_file.flush()
-        logging.info(f"{row.firstname} {row.lastname} → scraped")
-        time.sleep(1)
+        os.fsync(csv_file.fileno())
 
-    driver.quit()
-    csv_file.close()
+    driver = init_driver()
+    try:
+        linkedin_login(driver, email, pwd)
+
+        n = 0
+        for row in src.itertuples():
+            url = row.linkedin_profile
+            if url in done_urls:
+                continue
+
+            driver.get(url)          # grab_profile_data waits on the elements it reads
+
+            pdata = grab_profile_data(driver)
+            writer.writerow(
+                {
+                    "firstname": row.firstname,
+                    "lastname": row.lastname,
+                    "program": row.program,
+                    "linkedin_profile": url,
+                    **pdata,
+                }
+            )
+            n += 1
+            if n % FLUSH_EVERY == 0:
+                flush()
+            logging.info(f"{row.firstname} {row.lastname} → scraped")
+            time.sleep(random.uniform(0.3, 0.8))      # politeness jitter only
+    finally:
+        flush()                  # also reached on Ctrl-C – buffered rows are never lost
+        driver.quit()
+        csv_file.close()
     logging.info(f"Complete. Details in {DEST_CSV}")
 
 
@@ -5,39 +5,49 @@ clean_and_analyze_alumni.py
 Utility script for the School of Information (**NDU**) that:
 1. Reads the raw `output/alumni_linkedin_details.csv` produced by the scraper.
 2. Applies light cleaning so the Dean can open an immaculate sheet in Excel.
-3. Exports the cleaned data to `output/alumni_linkedin_details_clean.csv`.
-4. Creates a handful of informative charts (PNG format) in `output/plots/` to
+3. Exports the cleaned data to `output/alumni_linkedin_details_clean.csv`,
+   plus Parquet child tables (experience, education, …); set CHILD_CSV=1
+   to also get CSV copies of those.
+4. Creates one overview chart (PNG, 2×2 panels) in `output/plots/` to
    highlight cohort statistics and fun facts for 2014-2024 alumni.
 
 Usage (inside project root):
     python clean_and_analyze_alumni.py
 
-Dependencies: pandas, seaborn, matplotlib  (already standard in most DS stacks)
+Dependencies: pandas, pyarrow, seaborn, matplotlib  (already standard in most DS stacks)
 """
 
 from __future__ import annotations
 
+import csv
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any
 
 # Configure matplotlib to use a non-interactive backend (avoids Tk dependency)
 import matplotlib
 matplotlib.use("Agg")
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 import seaborn as sns
-from dateutil.parser import parse as date_parse
 
 # ─────────────────────── paths ──────────────────────────────────────────
 RAW_CSV     = Path("output/alumni_linkedin_details.csv")
 BASE_CSV    = Path("output/alumni_linkedin_details_clean.csv")
-EXP_CSV     = Path("output/alumni_experience.csv")
-EDU_CSV     = Path("output/alumni_education.csv")
-LIC_CSV     = Path("output/alumni_licenses.csv")
-VOL_CSV     = Path("output/alumni_volunteering.csv")
+EXP_OUT     = Path("output/alumni_experience.parquet")
+EDU_OUT     = Path("output/alumni_education.parquet")
+LIC_OUT     = Path("output/alumni_licenses.parquet")
+VOL_OUT     = Path("output/alumni_volunteering.parquet")
+CHILD_CSV   = os.getenv("CHILD_CSV", "0") == "1"     # also write .csv next to each .parquet
 
 PLOT_DIR    = Path("output/plots")
 
@@ -47,25 +57,9 @@ PLOT_DIR.mkdir(parents=True, exist_ok=True)
 
 # ─────────────────────── cleaning helpers ───────────────────────────────
 
-BASE64_PATTERN = re.compile(r"^data:image/[^;]+;base64,", re.I)
-DIGITS_PATTERN = re.compile(r"(\d+)")
-
-
-def _strip_base64(val: str) -> str:
-    """Remove inline base-64 images (Excel chokes on very long cells)."""
-    if isinstance(val, str) and BASE64_PATTERN.match(val):
-        return ""
-    return val
-
-
-def _clean_connections(val: str | int | float) -> int | None:
-    """Convert connection strings like "500+" or "1,234" to int."""
-    if pd.isna(val):
-        return None
-    if isinstance(val, (int, float)):
-        return int(val)
-    m = DIGITS_PATTERN.search(str(val).replace(",", ""))
-    return int(m.group(1)) if m else None
+EXP_PATTERN    = re.compile(r"(?P<title>.*?)\s*@\s*(?P<company>.*?)\s*[–-]\s*(?P<dates>.*)")
+DIGITS_PATTERN = re.compile(r"(?P<n>\d+)")   # named group – Arrow's extract_regex needs one
+DATE_RANGE_RE  = re.compile(r"[–-]")
 
 
 # ─────────────────────── main cleaning routine ──────────────────────────
@@ -83,192 +77,254 @@ def _safe_json_loads(raw: str) -> Any:
             return None
 
 
-def _parse_date(token: str) -> datetime | None:
-    token = token.strip()
-    if token.lower() in {"present", "current", "now"}:
-        return None
-    try:
-        dt = date_parse(token, default=datetime(1900, 1, 1))
-        return dt
-    except Exception:
-        return None
+OPEN_ENDED = frozenset({"present", "current", "now"})
+
 
+def _to_dates(tokens: pd.Series) -> pd.Series:
+    """Date tokens → datetimes in one call; open-ended / unparseable → NaT."""
+    tokens = tokens.astype("string").str.strip()     # the reindexed end column may be all-NaN float
+    tokens = tokens.where(~tokens.str.lower().isin(list(OPEN_ENDED)))
+    # cache=True parses each distinct "Jan 2020"-style token only once
+    return pd.to_datetime(tokens, errors="coerce", format="mixed", cache=True)
 
-def _split_date_range(range_str: str) -> tuple[datetime | None, datetime | None]:
-    parts = [p.strip() for p in re.split(r"[–-]", range_str, maxsplit=1)]
-    if len(parts) == 2:
-        return _parse_date(parts[0]), _parse_date(parts[1])
-    return _parse_date(parts[0]), None
+
+def _split_items(series: pd.Series) -> pd.Series:
+    """'a; b; c' cells → one stripped, non-empty item per row (index kept)."""
+    items = series.dropna().str.split("; ").explode().str.strip()
+    return items[items.fillna("") != ""]
 
 
 def _explode_series(name: str, series: pd.Series) -> pd.DataFrame:
     """Turn semicolon-separated strings into long form with seq index."""
-    rows: List[Dict[str, Any]] = []
-    for link, cell in series.items():
-        if pd.isna(cell) or not str(cell).strip():
-            continue
-        items = [i.strip() for i in str(cell).split("; ") if i.strip()]
-        for idx, itm in enumerate(items, start=1):
-            rows.append({"linkedin_profile": link, "seq": idx, name: itm})
-    return pd.DataFrame(rows)
-
-
-def _parse_experience(df: pd.DataFrame) -> pd.DataFrame:
-    rows: List[Dict[str, Any]] = []
-    for link, cell in df["experience"].items():
-        if pd.isna(cell) or not str(cell).strip():
-            continue
-        items = [i.strip() for i in str(cell).split("; ") if i.strip()]
-        for seq, item in enumerate(items, start=1):
-            m = re.match(r"(?P<title>.*?)\s*@\s*(?P<company>.*?)\s*[–-]\s*(?P<dates>.*)", item)
-            if m:
-                title   = m.group("title").strip()
-                company = m.group("company").strip()
-                date_rng= m.group("dates").strip()
-                start_d, end_d = _split_date_range(date_rng)
-            else:
-                title = company = item
-                start_d = end_d = None
-            rows.append({
-                "linkedin_profile": link,
-                "seq": seq,
-                "title": title,
-                "company": company,
-                "start_date": start_d,
-                "end_date": end_d,
-            })
-    return pd.DataFrame(rows)
+    items = _split_items(series)
+    return pd.DataFrame({
+        "linkedin_profile": items.index,
+        "seq": items.groupby(level=0).cumcount().to_numpy() + 1,
+        name: items.to_numpy(),
+    })
+
+
+def _parse_experience(series: pd.Series) -> pd.DataFrame:
+    items = _split_items(series)
+    parts = items.str.extract(EXP_PATTERN)          # all-NaN row where the item doesn't match
+    hit = parts["title"].notna()
+
+    # "Jan 2020 – Present" → start / end tokens, split once for the whole column
+    rng = parts["dates"].str.strip().str.split(DATE_RANGE_RE, n=1, expand=True)
+    rng = rng.reindex(columns=[0, 1])
+
+    return pd.DataFrame({
+        "linkedin_profile": items.index,
+        "seq": items.groupby(level=0).cumcount().to_numpy() + 1,
+        "title": parts["title"].str.strip().where(hit, items).to_numpy(),
+        "company": parts["company"].str.strip().where(hit, items).to_numpy(),
+        "start_date": _to_dates(rng[0]).to_numpy(),
+        "end_date": _to_dates(rng[1]).to_numpy(),
+    })
 
 
 def load_and_clean() -> pd.DataFrame:
     if not RAW_CSV.exists():
         raise FileNotFoundError(f"Raw CSV not found at {RAW_CSV!s}")
 
-    # Read everything as string to keep initial cleaning simple
-    df = pd.read_csv(RAW_CSV, dtype=str, keep_default_na=False)
-
-    # 1️⃣ Trim whitespace & newlines (applymap is deprecated from pandas 3.2)
-    for col in df.columns:
-        df[col] = (
-            df[col]
-            .astype(str)
-            .str.replace("\n", " ", regex=False)
-            .str.strip()
+    # Read everything as string to keep initial cleaning simple – multi-threaded
+    # Arrow parser, Arrow-backed string columns for the vectorized passes below.
+    # Section cells hold quoted multi-line innerText, hence newlines_in_values.
+    with RAW_CSV.open(newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    table = pacsv.read_csv(
+        RAW_CSV,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={col: pa.string() for col in header},
+            strings_can_be_null=False,
+        ),
+    )
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+    # 1️⃣ Trim whitespace & newlines – Arrow kernels straight on each column's
+    #    buffers (already strings, no cast), frame rebuilt once instead of a
+    #    setitem copy per column
+    df = pd.DataFrame({
+        col: pd.arrays.ArrowStringArray(
+            pc.utf8_trim_whitespace(pc.replace_substring(pa.array(df[col].array), "\n", " "))
         )
+        for col in df.columns
+    })
 
     # 2️⃣ Drop duplicate LinkedIn profiles (should be unique key)
     df = df.drop_duplicates(subset="linkedin_profile", keep="first")
 
-    # 3️⃣ Clean heavy / unnecessary fields
-    df["profile_pic"] = df["profile_pic"].map(_strip_base64)
-
-    # 4️⃣ Sanitize numeric-ish fields
-    df["connections"] = df["connections"].map(_clean_connections)
+    # 3️⃣ Clean heavy / unnecessary fields (inline base-64 images – Excel chokes on very long cells)
+    pic = df["profile_pic"]
+    df["profile_pic"] = pic.mask(
+        pic.str.startswith("data:image/") & pic.str.contains(";base64,", regex=False), ""
+    )
+
+    # 4️⃣ Sanitize numeric-ish fields ("500+" / "1,234" → nullable int) – one RE2
+    #    pass in Arrow; pandas' str.extract would fall back to per-cell Python re
+    digits = pc.extract_regex(
+        pc.replace_substring(pa.array(df["connections"].array), ",", ""), DIGITS_PATTERN.pattern
+    )
+    df["connections"] = pd.arrays.ArrowExtensionArray(
+        pc.cast(pc.struct_field(digits, [0]), pa.int64())
+    )
 
     # 5️⃣ (optional) sort for nicer appearance
-    df = df.sort_values(by=["lastname", "firstname"]).reset_index(drop=True)
+    df = df.sort_values(by=["lastname", "firstname"], kind="stable", ignore_index=True)
 
-    # 6️⃣ split location
-    loc_split = df["location"].str.split(r",\s*", expand=True)
-    if not loc_split.empty:
-        df["city"]     = loc_split[0]
-        df["state"]    = loc_split[1] if loc_split.shape[1] > 1 else pd.NA
-        df["country"]  = loc_split[2] if loc_split.shape[1] > 2 else pd.NA
+    # 6️⃣ split location – literal ", " (Arrow split_pattern), no regex per cell
+    loc_split = df["location"].str.split(", ", expand=True, regex=False).reindex(columns=[0, 1, 2])
+    df["city"]     = loc_split[0]
+    df["state"]    = loc_split[1]
+    df["country"]  = loc_split[2]
 
-    # 7️⃣ replace blank strings with NA
-    df.replace({"": pd.NA}, inplace=True)
+    # 7️⃣ replace blank strings with NA – string columns only (connections is
+    #    already int), one Arrow equality + mask per column
+    str_cols = df.select_dtypes("string").columns
+    df[str_cols] = df[str_cols].mask(df[str_cols] == "", pd.NA)
 
     return df
 
 
-# ─────────────────────── visualization helpers ─────────────────────────
+def write_csv(df: pd.DataFrame, path: Path) -> None:
+    """UTF-8 CSV via pyarrow's C++ writer (pandas formats every cell in Python)."""
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
 
-def plot_bar(series: pd.Series, title: str, fname: str, top_n: int = 10):
-    top = series.value_counts().head(top_n).sort_values(ascending=True)
-    plt.figure(figsize=(8, max(3, 0.4 * len(top))))
-    sns.barplot(x=top.values, y=top.index, palette="viridis")
-    plt.title(title)
-    plt.xlabel("Count")
-    plt.tight_layout()
-    plt.savefig(PLOT_DIR / fname)
-    plt.close()
+def write_table(df: pd.DataFrame, path: Path) -> None:
+    """Child table → zstd Parquet (one Arrow conversion), CSV copy if CHILD_CSV."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, path.with_suffix(".parquet"), compression="zstd")
+    if CHILD_CSV:
+        pacsv.write_csv(table, path.with_suffix(".csv"))
 
 
-def plot_hist(series: pd.Series, title: str, fname: str, bins: int = 10):
-    plt.figure(figsize=(7, 4))
-    sns.histplot(series.dropna(), kde=False, bins=bins, color="#4C72B0")
-    plt.title(title)
-    plt.xlabel(series.name)
-    plt.ylabel("Frequency")
-    plt.tight_layout()
-    plt.savefig(PLOT_DIR / fname)
-    plt.close()
+# ─────────────────────── visualization helpers ─────────────────────────
+
+def top_counts(series: pd.Series, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+    """(values, counts) of the k most frequent non-null values, most frequent first.
+
+    One hash count, then argpartition on the plain count array – only the k
+    winners get sorted.
+    """
+    counts = series.value_counts(sort=False)
+    vals, cnts = counts.index.to_numpy(), counts.to_numpy()
+    if len(cnts) > k:
+        part = np.argpartition(-cnts, k - 1)[:k]
+        vals, cnts = vals[part], cnts[part]
+    order = np.argsort(-cnts, kind="stable")
+    return vals[order], cnts[order]
+
+
+def plot_bar(series: pd.Series, title: str, ax: plt.Axes, top_n: int = 10):
+    vals, cnts = top_counts(series, top_n)
+    sns.barplot(x=cnts, y=vals, palette="viridis", ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel("Count")
+
+
+def plot_hist(series: pd.Series, title: str, ax: plt.Axes, bins: int = 10):
+    sns.histplot(series.dropna(), kde=False, bins=bins, color="#4C72B0", ax=ax)
+    ax.set_title(title)
+    ax.set_xlabel(series.name)
+    ax.set_ylabel("Frequency")
+
+
+def render_overview(program: pd.Series, company: pd.Series, location: pd.Series,
+                    connections: pd.Series) -> bytes:
+    """All four charts on one figure / one Agg canvas → overview.png.
+
+    Top-level so it can run in a worker process; it only receives the four
+    columns it plots, never the whole frame. Returns the PNG bytes so the
+    Excel step embeds them without reading the file back.
+    """
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    plot_bar(program, "Top Programs (count)", axes[0, 0])
+    plot_bar(company, "Top Current Companies (top 10)", axes[0, 1])
+    plot_bar(location, "Top Locations (top 10)", axes[1, 0])
+    plot_hist(connections, "Distribution of LinkedIn Connections", axes[1, 1], bins=15)
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    png = buf.getvalue()
+    (PLOT_DIR / "overview.png").write_bytes(png)
+    return png
 
 
 # ─────────────────────── orchestrator ──────────────────────────────────
 
+def _rel(path: Path, cwd: Path) -> Path:
+    """Path relative to the (pre-resolved) cwd for printing, absolute if outside it."""
+    path = path.resolve()
+    return path.relative_to(cwd) if path == cwd or cwd in path.parents else path
+
+
 def main() -> None:
+    cwd = Path.cwd().resolve()            # resolved once for every "→ path" message
     print("Loading & cleaning …")
     clean_df = load_and_clean()
 
     # Export to clean CSV (UTF-8 w/out BOM for Excel compatibility)
-    clean_df.to_csv(BASE_CSV, index=False, encoding="utf-8")
-    try:
-        rel_path = BASE_CSV.resolve().relative_to(Path.cwd())
-    except ValueError:
-        rel_path = BASE_CSV.resolve()
-    print(f"✔ Clean CSV written → {rel_path}")
+    write_csv(clean_df, BASE_CSV)
+    print(f"✔ Clean CSV written → {_rel(BASE_CSV, cwd)}")
 
-    # ───────── child tables ─────────
-    print("Normalizing experience/education/licensing/volunteering …")
-    base_idx = clean_df.set_index("linkedin_profile")
+    # ───────── generate fun stats (worker process, overlaps the child tables) ─────────
+    print("Generating plots …")
+    with ProcessPoolExecutor(max_workers=1) as plot_pool:
+        plots_done = plot_pool.submit(
+            render_overview,
+            clean_df["program"],
+            clean_df["current_company"],
+            clean_df["location"],
+            clean_df["connections"].astype(float),
+        )
 
-    exp_df = _parse_experience(base_idx)
-    edu_df = _explode_series("education", base_idx["education"])
-    lic_df = _explode_series("licenses",  base_idx["licenses"])
-    vol_df = _explode_series("volunteering", base_idx["volunteering"])
+        # ───────── child tables ─────────
+        print("Normalizing experience/education/licensing/volunteering …")
+        # each column re-labelled by profile URL – shares the column's buffer,
+        # no set_index copy of the whole frame
+        profiles = pd.Index(clean_df["linkedin_profile"])
 
-    exp_df.to_csv(EXP_CSV, index=False)
-    edu_df.to_csv(EDU_CSV, index=False)
-    lic_df.to_csv(LIC_CSV, index=False)
-    vol_df.to_csv(VOL_CSV, index=False)
+        def by_profile(col: str) -> pd.Series:
+            return pd.Series(clean_df[col].array, index=profiles, name=col, copy=False)
 
-    print("✔ Child tables saved (experience, education, licenses, volunteering)")
+        exp_df = _parse_experience(by_profile("experience"))
+        edu_df = _explode_series("education", by_profile("education"))
+        lic_df = _explode_series("licenses",  by_profile("licenses"))
+        vol_df = _explode_series("volunteering", by_profile("volunteering"))
 
-    # ───────── generate fun stats ─────────
-    print("Generating plots …")
-    plot_bar(clean_df["program"], "Top Programs (count)", "program_counts.png")
-    plot_bar(clean_df["current_company"], "Top Current Companies (top 10)", "company_counts.png")
-    plot_bar(clean_df["location"], "Top Locations (top 10)", "location_counts.png")
-    plot_hist(clean_df["connections"].astype(float), "Distribution of LinkedIn Connections", "connections_hist.png", bins=15)
+        write_table(exp_df, EXP_OUT)
+        write_table(edu_df, EDU_OUT)
+        write_table(lic_df, LIC_OUT)
+        write_table(vol_df, VOL_OUT)
 
-    try:
-        plots_rel = PLOT_DIR.resolve().relative_to(Path.cwd())
-    except ValueError:
-        plots_rel = PLOT_DIR.resolve()
-    print(f"✔ Plots stored in {plots_rel} (PNG files)")
+        print("✔ Child tables saved as Parquet (experience, education, licenses, volunteering)")
+
+        charts = {"overview": plots_done.result()}   # Excel below embeds the PNG bytes
+
+    print(f"✔ Plots stored in {_rel(PLOT_DIR, cwd)} (PNG files)")
 
     # ───────── embed into Excel ─────────
     excel_file = BASE_CSV.with_suffix(".xlsx")
     print("Creating Excel workbook with embedded charts …")
     try:
-        with pd.ExcelWriter(excel_file, engine="xlsxwriter") as writer:
+        with pd.ExcelWriter(excel_file, engine="xlsxwriter",
+                            engine_kwargs={"options": {"in_memory": True}}) as writer:
             clean_df.to_excel(writer, sheet_name="Alumni", index=False)
 
             workbook  = writer.book
             chart_ws  = workbook.add_worksheet("Charts")
 
             row = 0
-            for img in sorted(PLOT_DIR.glob("*.png")):
-                chart_ws.write(row, 0, img.stem.replace("_", " ").title())
-                chart_ws.insert_image(row + 1, 0, str(img), {"x_scale": 0.9, "y_scale": 0.9})
+            for name, png in charts.items():
+                chart_ws.write(row, 0, name.replace("_", " ").title())
+                chart_ws.insert_image(row + 1, 0, f"{name}.png",
+                                      {"image_data": BytesIO(png), "x_scale": 0.9, "y_scale": 0.9})
                 row += 26  # adjust spacing between charts
 
-        try:
-            rel_excel = excel_file.resolve().relative_to(Path.cwd())
-        except ValueError:
-            rel_excel = excel_file.resolve()
-        print(f"✔ Excel workbook created → {rel_excel}")
+        print(f"✔ Excel workbook created → {_rel(excel_file, cwd)}")
     except ImportError:
         print("⚠ xlsxwriter not available – skipped Excel embedding. `pip install xlsxwriter` to enable this feature.")
 
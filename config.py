@@ -15,7 +15,9 @@ SEARCH_SETTINGS = {
     "delay_between_profiles": 3,    # Delay in seconds between profile scrapes
     "timeout_wait": 10,             # Wait timeout for page elements in seconds
     "max_pages_per_institution": 5, # Number of pages to scrape per institution
-    "page_load_delay": 2            # Delay in seconds after loading a new page
+    "page_load_delay": 2,           # Delay in seconds after loading a new page
+    "workers": 3,                   # Concurrent browser sessions (one institution each)
+    "max_rate": 0.5                 # LinkedIn page loads per second across all sessions
 }
 
 # Output settings
@@ -47,6 +49,13 @@ OPENAI_SETTINGS = {
     "max_tokens": 1000,
     "temperature": 0.7,
     "enabled": True,  # Set to True if you want to use OpenAI API
+    "only_when_dom_fails": True,  # skip Vision for pages whose cards all parse from the DOM
+    "concurrency": 5,       # Vision requests in flight at once (all workers)
+    "max_rate": 4,          # Vision requests started per second (all workers)
+    "pages_per_call": 4,    # result-page screenshots packed into one Vision request
+    "detail": "auto",       # Vision image detail – "low" squeezes a whole results list into 512 px
+    "vision_max_width": 768,  # results-list screenshots are downscaled to at most this width
+    "image_format": "webp",   # "webp" (smallest upload) or "jpeg" if the deployment rejects WebP
 }
 
 # LinkedIn uses dynamic class names that change frequently
@@ -1,22 +1,30 @@
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from pathlib import Path
 
 # ---- paths ---------------------------------------------------------
 SRC_CSV   = "output/alumni_linkedin_urls.csv"        # source file
-DEST_CSV  = "output/alumni_linkedin_urls_FOUND.csv"  # rows with real URLs
+DEST_CSV  = "output/alumni_linkedin_urls_FOUND.csv"  # only rows whose URL starts with http
 
-# ---- load & analyse -----------------------------------------------
-df = pd.read_csv(SRC_CSV)
+# ---- load & analyse (Arrow: multi-threaded parse, C++ filter) ------
+t = pacsv.read_csv(
+    SRC_CSV, convert_options=pacsv.ConvertOptions(column_types={"linkedin_profile": pa.string()})
+)
 
-mask_found = df["linkedin_profile"].str.upper() != "NOT FOUND"
-n_found    = mask_found.sum()
-n_missing  = (~mask_found).sum()
+# keep exactly the rows the scrapers can visit – "NOT FOUND", blanks and any
+# other placeholder are dropped here, once, instead of in every scraper loop
+url        = t["linkedin_profile"]
+mask_found = pc.fill_null(pc.starts_with(url, "http"), False)
+n_found    = pc.sum(mask_found).as_py() or 0
+n_missing  = pc.sum(pc.fill_null(pc.equal(pc.utf8_upper(url), "NOT FOUND"), False)).as_py() or 0
 
-print(f"Total rows   : {len(df):,}")
+print(f"Total rows   : {t.num_rows:,}")
 print(f"Found URLs   : {n_found:,}")
 print(f"NOT FOUND    : {n_missing:,}")
+print(f"Other/blank  : {t.num_rows - n_found - n_missing:,}")
 
 # ---- save only rows that have a URL --------------------------------
 Path(DEST_CSV).parent.mkdir(exist_ok=True)
-df[mask_found].to_csv(DEST_CSV, index=False)
+pacsv.write_csv(t.filter(mask_found), DEST_CSV)
 print(f"Saved {n_found:,} rows with LinkedIn URLs → {DEST_CSV}")
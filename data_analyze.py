@@ -1,5 +1,6 @@
 import json
 import os
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from collections import Counter
@@ -28,7 +29,7 @@ def create_dataframe(profiles):
     df = df.fillna("")
     
     # Extract institution names to ensure consistent format
-    df['searched_institution'] = df['searched_institution'].apply(lambda x: str(x).strip())
+    df['searched_institution'] = df['searched_institution'].astype(str).str.strip()
     
     return df
 
@@ -66,16 +67,16 @@ def analyze_job_titles(df):
     for title, count in title_counter.most_common(10):
         print(f"  {title}: {count}")
     
-    # Analyze job levels
-    job_levels = analyze_job_levels(job_titles)
+    # Analyze job levels (ranked once, reused for the printout and the plot)
+    job_levels = analyze_job_levels(job_titles).most_common()
     print("\nJob levels distribution:")
-    for level, count in job_levels.most_common():
+    for level, count in job_levels:
         print(f"  {level}: {count}")
     
     # Plot job levels
     plt.figure(figsize=(10, 6))
-    levels = [level for level, _ in job_levels.most_common()]
-    counts = [count for _, count in job_levels.most_common()]
+    levels = [level for level, _ in job_levels]
+    counts = [count for _, count in job_levels]
     
     plt.bar(levels, counts)
     plt.title('Job Level Distribution')
@@ -89,28 +90,7 @@ def analyze_job_titles(df):
 
 def analyze_job_levels(job_titles):
     """Categorize job titles into levels"""
-    leadership_keywords = ['chief', 'ceo', 'cfo', 'cto', 'cio', 'president', 'founder']
-    director_keywords = ['director', 'vp', 'vice president', 'head of']
-    manager_keywords = ['manager', 'lead', 'senior', 'principal']
-    associate_keywords = ['associate', 'specialist', 'analyst', 'consultant']
-    
-    job_levels = Counter()
-    
-    for title in job_titles:
-        title_lower = title.lower()
-        
-        if any(keyword in title_lower for keyword in leadership_keywords):
-            job_levels['C-Suite/Leadership'] += 1
-        elif any(keyword in title_lower for keyword in director_keywords):
-            job_levels['Director/VP'] += 1
-        elif any(keyword in title_lower for keyword in manager_keywords):
-            job_levels['Manager/Senior'] += 1
-        elif any(keyword in title_lower for keyword in associate_keywords):
-            job_levels['Associate/Specialist'] += 1
-        else:
-            job_levels['Other'] += 1
-    
-    return job_levels
+    return Counter(categorize_job_levels(pd.Series(job_titles, dtype=object)))
 
 def analyze_companies(df):
     """Analyze companies from profiles"""
@@ -124,15 +104,15 @@ def analyze_companies(df):
         return
 
     # Count the most common companies
-    company_counter = Counter(companies)
+    top = Counter(companies).most_common(15)   # ranked once; top 10 printed, 15 plotted
     print("\nTop 10 companies:")
-    for company, count in company_counter.most_common(10):
+    for company, count in top[:10]:
         print(f"  {company}: {count}")
     
     # Plot top companies
     plt.figure(figsize=(12, 6))
-    top_companies = [company for company, _ in company_counter.most_common(15)]
-    company_counts = [count for _, count in company_counter.most_common(15)]
+    top_companies = [company for company, _ in top]
+    company_counts = [count for _, count in top]
     
     plt.barh(top_companies, company_counts)
     plt.title('Top 15 Companies')
@@ -162,15 +142,15 @@ def analyze_locations(df):
             regions.append(parts[0].strip())
     
     # Count the most common regions
-    region_counter = Counter(regions)
+    top = Counter(regions).most_common(10)     # ranked once for the printout and the plot
     print("\nTop 10 regions:")
-    for region, count in region_counter.most_common(10):
+    for region, count in top:
         print(f"  {region}: {count}")
     
     # Plot top regions
     plt.figure(figsize=(12, 6))
-    top_regions = [region for region, _ in region_counter.most_common(10)]
-    region_counts = [count for _, count in region_counter.most_common(10)]
+    top_regions = [region for region, _ in top]
+    region_counts = [count for _, count in top]
     
     plt.barh(top_regions, region_counts)
     plt.title('Top 10 Regions')
@@ -198,7 +178,7 @@ def analyze_education_to_job_correlation(df):
         return
     
     # Categorize job titles into levels
-    df_filtered['job_level'] = df_filtered['job_title'].apply(categorize_job_level)
+    df_filtered['job_level'] = categorize_job_levels(df_filtered['job_title'])
     
     # Create a crosstab of institution vs. job level
     crosstab = pd.crosstab(df_filtered['searched_institution'], df_filtered['job_level'])
@@ -212,20 +192,33 @@ def analyze_education_to_job_correlation(df):
     plt.close()
     print("\nInstitution to job correlation heatmap saved as 'institution_job_correlation.png'")
 
-def categorize_job_level(job_title):
-    """Categorize a job title into a job level"""
-    job_title = str(job_title).lower()
-    
-    if any(keyword in job_title for keyword in ['chief', 'ceo', 'cfo', 'cto', 'cio', 'president', 'founder']):
-        return 'C-Suite/Leadership'
-    elif any(keyword in job_title for keyword in ['director', 'vp', 'vice president', 'head of']):
-        return 'Director/VP'
-    elif any(keyword in job_title for keyword in ['manager', 'lead', 'senior', 'principal']):
-        return 'Manager/Senior'
-    elif any(keyword in job_title for keyword in ['associate', 'specialist', 'analyst', 'consultant']):
-        return 'Associate/Specialist'
-    else:
-        return 'Other'
+# First match wins, so the order matters
+JOB_LEVELS = [
+    ('C-Suite/Leadership', ['chief', 'ceo', 'cfo', 'cto', 'cio', 'president', 'founder']),
+    ('Director/VP', ['director', 'vp', 'vice president', 'head of']),
+    ('Manager/Senior', ['manager', 'lead', 'senior', 'principal']),
+    ('Associate/Specialist', ['associate', 'specialist', 'analyst', 'consultant']),
+]
+
+# One optional lookahead per level, all anchored at the start: a single search
+# records every level present (l0, l1, …) regardless of where in the title it
+# occurs, so precedence stays with JOB_LEVELS rather than match position
+JOB_LEVEL_RE = re.compile(
+    "^" + "".join(
+        f"(?:(?=.*?(?P<l{rank}>{'|'.join(map(re.escape, keywords))})))?"
+        for rank, (_, keywords) in enumerate(JOB_LEVELS)
+    ),
+    re.S,
+)
+
+def categorize_job_levels(job_titles):
+    """Categorize a Series of job titles into job levels: one JOB_LEVEL_RE search per title"""
+    hits = job_titles.astype(str).str.lower().str.extract(JOB_LEVEL_RE).notna().to_numpy()
+    labels = np.array([level for level, _ in JOB_LEVELS])
+    return pd.Series(
+        np.where(hits.any(axis=1), labels[hits.argmax(axis=1)], 'Other'),
+        index=job_titles.index,
+    )
 
 def export_to_csv(df, output_path="alumni_analysis.csv"):
     """Export the data to CSV for further analysis"""
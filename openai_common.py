@@ -0,0 +1,71 @@
+"""
+openai_common.py  ⟶  OpenAI plumbing shared by every scraper
+──────────────────────────────────────────────────────────────────────────────
+Used by scrape_profile.py, alumni_details_scraper.py and people_alumni_scraper.py.
+Importing it has no side effects – no thread, no connection, no directory –
+so the search scraper can use it without the profile scrapers' worker machinery.
+
+• the pooled HTTP/2 client every OpenAI / Azure client is built on
+• the sqlite Vision cache at cache/vision.sqlite (VISION_CACHE=0 turns it off)
+──────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+import os, time, json, sqlite3, threading
+from pathlib import Path
+from typing import Any, Dict
+
+# ─────────────────────────── OpenAI client ───────────────────────────────
+
+def pooled_http_client():
+    """httpx.AsyncClient over one HTTP/2 pool – TLS handshakes are paid once and
+    concurrent calls multiplex over the same connection."""
+    import httpx
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=60.0,
+    )
+
+
+def openai_client(api_key: str):
+    """AsyncOpenAI on :func:`pooled_http_client`."""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=api_key, http_client=pooled_http_client())
+
+# ──────────────────────────── Vision cache ───────────────────────────────
+# Vision answers are memoized by (prompt, exact screenshot): re-scrapes never pay
+# twice for a capture already sent. Each scraper builds its own keys.
+CACHE_DB  = Path("cache/vision.sqlite")
+CACHE_TTL = 30 * 86400      # seconds a cached Vision answer stays valid
+USE_CACHE = os.getenv("VISION_CACHE", "1") != "0"
+
+_vcache: sqlite3.Connection | None = None
+_vcache_lock = threading.Lock()
+
+
+def _cache_db() -> sqlite3.Connection:
+    """The cache connection, opened on first use and shared by every thread."""
+    global _vcache
+    with _vcache_lock:
+        if _vcache is None:
+            CACHE_DB.parent.mkdir(exist_ok=True)
+            _vcache = sqlite3.connect(CACHE_DB, check_same_thread=False, isolation_level=None)
+            _vcache.execute("CREATE TABLE IF NOT EXISTS vision (key TEXT PRIMARY KEY, ts REAL, json TEXT)")
+        return _vcache
+
+
+def cache_get(key: str) -> Dict[str, Any] | None:
+    if not USE_CACHE:
+        return None
+    row = _cache_db().execute(
+        "SELECT json FROM vision WHERE key = ? AND ts > ?", (key, time.time() - CACHE_TTL)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def cache_put(key: str, result: Dict[str, Any]) -> None:
+    if USE_CACHE:
+        _cache_db().execute(
+            "INSERT OR REPLACE INTO vision VALUES (?, ?, ?)", (key, time.time(), json.dumps(result))
+        )
@@ -1,7 +1,7 @@
 """
 alumni_details_scraper.py  ⟶  pulls rich profile data for every LinkedIn URL
 ──────────────────────────────────────────────────────────────────────────────
-INPUT   : output/alumni_linkedin_urls.csv        (must already exist)
+INPUT   : output/alumni_linkedin_urls_FOUND.csv  (count.py – http URLs only)
 OUTPUT  : output/alumni_linkedin_details.csv     (appends / resumes)
 
 New columns captured
@@ -19,13 +19,19 @@ New columns captured
 
 Technique
 ─────────
-• Selenium logs in once.
+• A pool of Chrome workers (SCRAPER_WORKERS, default 4) – each logs in once
+  with its own --user-data-dir and scrapes profiles in parallel.
 • Loads each profile, *scrolls to the very bottom* (lazy sections load).
-• Resizes window to full page height then screenshots once.
-• Sends the screenshot to **OpenAI Vision** with an explicit JSON-only prompt
-  requesting the fields above.
+• Reads the header and the top-3 entries of every section straight from the
+  DOM in one execute_script round-trip.
+• Only when the DOM misses a required field: captures the full page once via
+  Chrome DevTools (no window resize) and sends it to **OpenAI Vision** with an
+  explicit JSON-only prompt requesting the fields above.
 • Merges Vision JSON with DOM-fetched picture-URL & e-mail (from “Contact info”).
-• Writes to CSV *after every profile* (safe resume).
+• VISION_MODE=batch: screenshots are queued as OpenAI Batch API requests
+  (half price) instead; the answers are merged into OUT_CSV after the run.
+• The main thread is the only CSV writer; rows are flushed in batches and
+  the resume sidecar only records flushed rows (safe resume).
 
 Set env vars (or answer prompts):
     OPENAI_API_KEY   – GPT-4o-mini Vision used if provided, else Vision skipped
@@ -35,15 +41,14 @@ Set env vars (or answer prompts):
 """
 
 from __future__ import annotations
-import os, csv, time, json, base64, logging
+import os, re, csv, time, json, base64, hashlib, logging, asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
@@ -51,13 +56,39 @@ from selenium.common.exceptions import (
     WebDriverException,
 )
 
+from openai_common import cache_get, cache_put, openai_client
+from scraper_common import (
+    BatchQueue, fill_csv, load_done, open_output, polite_pause, profile_slug, quit_drivers, resolved, run_async, run_workers,
+    start_worker, wait, worker_driver,
+)
+
 # ── CONFIG ──────────────────────────────────────────────────────────────
 IN_CSV   = Path("output/alumni_linkedin_urls_FOUND.csv")
 OUT_CSV  = Path("output/alumni_linkedin_details.csv")
+DONE_TXT = OUT_CSV.with_suffix(".done.txt")   # resume set shared with alumni_details_scraper.py
 SHOTDIR  = Path("screenshots")
+PROFILE_DIR = Path("chrome_profile")  # one people_worker_N sub-dir per Chrome session
+COOKIES     = PROFILE_DIR / "people_cookies.pkl"   # the one real login, adopted by every worker
+WORKERS     = int(os.getenv("SCRAPER_WORKERS", "4"))   # parallel Chrome sessions – keep ≤ 8
+HEADLESS    = os.getenv("SCRAPER_HEADLESS", "1") != "0"   # 0 → visible windows for debugging
 WAIT_HEAD   = 8         # seconds for top of profile
 WAIT_MODAL  = 12        # contact-info modal
-PAUSE_SCROLL= 0.3       # pause between scroll increments
+PAUSE_SCROLL= 0.25      # pause between scroll increments
+SCROLL_TIMEOUT = 30     # seconds the in-page scroller may run
+PAGE_WIDTH  = 1920      # CSS px captured across
+SHOT_WIDTH  = 1024      # px wide as sent to Vision – image tokens grow with area
+SHOT_JPEG_Q = 75
+MAX_SHOT_H  = 16000     # CSS px – Chrome fails / balloons in memory beyond ~16k tall captures
+VISION_MODE = os.getenv("VISION_MODE", "live")  # "batch" → OpenAI Batch API after the scrape
+VISION_CONCURRENCY = int(os.getenv("VISION_CONCURRENCY", "10"))  # live requests in flight
+# locators built once – every call site reuses the same tuple
+HEAD_PANEL   = (By.CSS_SELECTOR, "div.pv-text-details__left-panel")
+CONTACT_LINK = (By.ID, "top-card-text-details-contact-info")
+MODAL        = (By.CSS_SELECTOR, "section.artdeco-modal")
+MAIL_LINK    = (By.CSS_SELECTOR, "a[href^='mailto:']")
+DISMISS_BTN  = (By.CSS_SELECTOR, "button[aria-label='Dismiss']")
+# fonts, video, ads & trackers – the Vision prompt only needs the page text
+BLOCKED_URLS = ["*.woff*", "*.mp4", "*doubleclick*", "*google-analytics*", "*/ads/*"]
 PROMPT = (
     "From this LinkedIn profile page extract the following JSON object ONLY:\n"
     '{\n'
@@ -70,8 +101,25 @@ PROMPT = (
     ' "licenses":   [],          # list of up to 3 licenses / certs\n'
     ' "volunteering":[]          # list of up to 3 items\n'
     '}\n'
-    "Return *pure JSON* – no markdown."
+    "Return the JSON object only."
 )
+# Structured Outputs: the reply is constrained to exactly these keys / types
+_TEXT_KEYS = ("current_title", "current_company", "second_title", "second_company",
+              "third_title", "third_company", "location", "connections", "headline")
+_LIST_KEYS = ("experience", "education", "licenses", "volunteering")
+PROFILE_SCHEMA = {
+    "name": "profile",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            **{k: {"type": "string"} for k in _TEXT_KEYS},
+            **{k: {"type": "array", "items": {"type": "string"}} for k in _LIST_KEYS},
+        },
+        "required": [*_TEXT_KEYS, *_LIST_KEYS],
+        "additionalProperties": False,
+    },
+}
 
 # ── LOGGING ──────────────────────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO,
@@ -82,116 +130,299 @@ logging.getLogger("selenium").setLevel(logging.WARNING)
 OPENAI_KEY = os.getenv("OPENAI_API_KEY") or input("OpenAI key (blank to skip): ").strip()
 USE_VISION = bool(OPENAI_KEY)
 if USE_VISION:
-    from openai import OpenAI
-    oaclient = OpenAI(api_key=OPENAI_KEY)
+    aoaclient = openai_client(OPENAI_KEY)
+
+_vision_sem = asyncio.Semaphore(VISION_CONCURRENCY)
 
-def call_vision(img: Path) -> Dict[str, Any]:
+# Keyed by (prompt, exact screenshot bytes) – a resumed or re-run scrape never
+# pays twice for a capture it already sent.
+def _cache_key(b64: str) -> str:
+    h = hashlib.blake2b(b64.encode(), digest_size=16).hexdigest()
+    return f"{hashlib.sha1(PROMPT.encode()).hexdigest()[:8]}_{h}"
+
+def _vision_body(b64: str, mime: str = "image/jpeg") -> Dict[str, Any]:
+    """Chat-completions request body – shared by live calls and Batch lines."""
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": PROMPT},
+                {"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}}
+            ],
+        }],
+        "response_format": {"type": "json_schema", "json_schema": PROFILE_SCHEMA},
+        "max_tokens": 1024,
+        "temperature": 0,
+    }
+
+async def call_vision(b64: str, mime: str = "image/jpeg") -> Dict[str, Any]:
+    """*b64* is the screenshot exactly as CDP returns it – no decode / re-encode."""
     if not USE_VISION:
         return {}
+    key = _cache_key(b64)
+    if (hit := cache_get(key)) is not None:
+        logging.debug(f"Vision cache hit ({key[:16]})")
+        return hit
     try:
-        b64 = base64.b64encode(img.read_bytes()).decode()
-        rsp = oaclient.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": PROMPT},
-                    {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{b64}"}}
-                ],
-            }],
-            max_tokens=1024,
-            temperature=0,
-        )
-        txt = rsp.choices[0].message.content
-        if "```" in txt:                     # strip markdown fences
-            txt = txt.split("```")[1] if txt.startswith("```") else txt.split("```")[0]
-        return json.loads(txt)
+        async with _vision_sem:              # at most VISION_CONCURRENCY in flight
+            rsp = await aoaclient.chat.completions.create(**_vision_body(b64, mime))
+        result = json.loads(rsp.choices[0].message.content)
     except Exception as e:                   # noqa: BLE001
         logging.error(f"Vision failed – {e}")
         return {}
+    cache_put(key, result)
+    return result
+
+def submit_vision(b64: str, mime: str = "image/jpeg") -> Future:
+    """Start :func:`call_vision` without blocking; ``.result()`` gives the payload."""
+    return run_async(call_vision(b64, mime))
+
+def _flatten(vis: Dict[str, Any]) -> Dict[str, Any]:
+    """Vision list fields → semicolon-strings for CSV."""
+    for key in _LIST_KEYS:
+        if key in vis and isinstance(vis[key], list):
+            vis[key] = "; ".join(vis[key])
+    return vis
+
+# ── OPENAI BATCH API (VISION_MODE=batch) ────────────────────────────────
+BATCH = BatchQueue(Path("cache/people_batch_queue.jsonl"), Path("cache/people_batch_sent.txt"))
+
+def queue_vision(slug: str, b64: str, mime: str = "image/jpeg") -> Future:
+    """Batch-mode twin of :func:`submit_vision` – cache hit now, else queued and {}."""
+    if not USE_VISION:
+        return resolved({})
+    key = _cache_key(b64)
+    if (hit := cache_get(key)) is not None:
+        return resolved(hit)
+    BATCH.add([(f"{slug}|{key}", _vision_body(b64, mime))])
+    return resolved({})
+
+def apply_batch() -> None:
+    """Run the queued Batch jobs and fill the still-empty Vision columns of OUT_CSV."""
+    if not USE_VISION or not BATCH.pending():
+        return
+    merged: Dict[str, Dict[str, Any]] = {}
+    for cid, payload in BATCH.results(aoaclient):
+        slug, key = cid.split("|")
+        cache_put(key, payload)
+        merged[slug] = _flatten(payload)
+    fill_csv(OUT_CSV, merged)
+    BATCH.merged()
+    logging.info(f"Batch results merged for {len(merged)} profiles")
+
+# debug screenshot writes run here, never on the scrape loop
+io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="shot-io")
+
+def _dump_shot(path: Path, b64: str) -> None:
+    """Debug copy of a capture – decoded here so the worker only hands over the string."""
+    path.write_bytes(base64.b64decode(b64))
 
 # ── SELENIUM UTILITIES ──────────────────────────────────────────────────
-def init_driver() -> webdriver.Chrome:
+def init_driver(profile_dir: Path | None = None) -> webdriver.Chrome:
     opt = Options()
     opt.add_argument("--start-maximized")
     opt.add_argument("--disable-notifications")
-    return webdriver.Chrome(options=opt)
-
-def linkedin_login(driver: webdriver.Chrome, email: str, pwd: str) -> None:
-    driver.get("https://www.linkedin.com/login")
-    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.ID, "username")))
-    driver.find_element(By.ID, "username").send_keys(email)
-    driver.find_element(By.ID, "password").send_keys(pwd)
-    driver.find_element(By.XPATH, "//button[@type='submit']").click()
-    WebDriverWait(driver, 15).until(
-        EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder,'Search')]"))
-    )
-    logging.info("Logged in.")
-
-def scroll_full_page(driver: webdriver.Chrome) -> None:
-    last_h = 0
-    while True:
-        driver.execute_script("window.scrollBy(0, 600);")
-        time.sleep(PAUSE_SCROLL)
-        new_h = driver.execute_script("return window.pageYOffset + window.innerHeight;")
-        doc_h = driver.execute_script("return document.body.scrollHeight;")
-        if new_h >= doc_h or new_h == last_h:
-            break
-        last_h = new_h
-    # resize window to full height – allows single full-page screenshot
-    full_h = driver.execute_script("return document.body.scrollHeight;")
-    driver.set_window_size(1920, full_h)
-
-def grab_dom_bits(driver: webdriver.Chrome) -> Dict[str, str]:
-    out = {"profile_pic": "", "email": ""}
-    # picture
+    if HEADLESS:                             # no window / GPU compositor per worker
+        opt.add_argument("--headless=new")
+        opt.add_argument(f"--window-size={PAGE_WIDTH},1080")
+        opt.add_argument("--disable-gpu")
+        opt.add_argument("--no-sandbox")
+        opt.add_argument("--disable-dev-shm-usage")
+    if profile_dir:                          # separate profile per worker – sessions never collide
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        opt.add_argument(f"--user-data-dir={profile_dir.resolve()}")
+    # fields come from DOM text (img src attributes survive) – never fetch image bytes
+    opt.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    opt.add_argument("--blink-settings=imagesEnabled=false")
+    opt.page_load_strategy = "eager"
+    drv = webdriver.Chrome(options=opt, keep_alive=True)   # one pooled socket to chromedriver
+    drv.set_script_timeout(SCROLL_TIMEOUT)
+    drv.execute_cdp_cmd("Network.enable", {})
+    drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    return drv
+
+# whole scroll loop runs in the browser – one round‑trip instead of three per step
+# resolves only once the bottom is reached *and* one more pause loaded nothing
+# new, so lazy sections appended at the bottom are still scrolled through
+SCROLL_JS = """
+const pause = arguments[0], done = arguments[arguments.length - 1];
+let lastH = -1;
+(function step() {
+  window.scrollBy(0, 800);
+  setTimeout(() => {
+    const h = document.body.scrollHeight;
+    if (window.pageYOffset + window.innerHeight >= h && h === lastH) done(h);
+    else { lastH = h; step(); }
+  }, pause);
+})();
+"""
+
+def scroll_full_page(driver: webdriver.Chrome) -> int:
     try:
-        pic = driver.find_element(By.CSS_SELECTOR, "img.pv-top-card-profile-picture__image")
-        out["profile_pic"] = pic.get_attribute("src")
-    except NoSuchElementException:
-        try:  # fallback
-            pic = driver.find_element(By.CSS_SELECTOR, "img[id^='ember'][class*='profile']")
-            out["profile_pic"] = pic.get_attribute("src")
-        except NoSuchElementException:
-            pass
-    # email (contact modal)
+        return driver.execute_async_script(SCROLL_JS, int(PAUSE_SCROLL * 1000))
+    except TimeoutException:                 # page kept growing – take what is there
+        logging.debug("Page still growing at script timeout – continuing anyway.")
+        return driver.execute_script("return document.body.scrollHeight")
+
+
+def capture_full_page(driver: webdriver.Chrome, full_h: int) -> str:
+    """Base64 full-page JPEG via CDP – no window resize / re-layout of a 15k-px viewport.
+
+    Chrome rasterizes straight at SHOT_WIDTH (clip scale), so the page arrives
+    already downscaled – no decode / resize / re-encode round-trip in Python.
+    """
+    shot = driver.execute_cdp_cmd("Page.captureScreenshot", {
+        "format": "jpeg",
+        "quality": SHOT_JPEG_Q,
+        "captureBeyondViewport": True,
+        "clip": {"x": 0, "y": 0, "width": PAGE_WIDTH, "height": min(full_h, MAX_SHOT_H),
+                 "scale": SHOT_WIDTH / PAGE_WIDTH},
+    })
+    return shot["data"]
+
+# Whole profile in one round-trip: header texts + every top-level entry of the
+# anchored sections as its visible spans ("sub" = nested roles at one company)
+PROFILE_JS = """
+const txt = sel => {
+  const el = document.querySelector(sel);
+  return el ? el.innerText.trim() : '';
+};
+const spans = li => Array.from(li.querySelectorAll("span[aria-hidden='true']"))
+  .filter(s => s.closest('li') === li)
+  .map(s => s.innerText.trim()).filter(Boolean);
+const items = id => {
+  const anchor = document.getElementById(id);
+  const sec = anchor && anchor.closest('section');
+  if (!sec) return [];
+  return Array.from(sec.querySelectorAll('li'))
+    .filter(li => !li.parentElement.closest('li'))
+    .map(li => ({spans: spans(li),
+                 sub: Array.from(li.querySelectorAll('li')).map(spans).filter(a => a.length)}))
+    .filter(it => it.spans.length);
+};
+const pic = document.querySelector(
+  "img.pv-top-card-profile-picture__image, img[id^='ember'][class*='profile']");
+return {
+  profile_pic:  pic ? pic.src : '',
+  headline:     txt('div.pv-text-details__left-panel .text-body-medium, div.text-body-medium.break-words'),
+  location:     txt('.pv-text-details__left-panel span.text-body-small:not([aria-hidden]), ' +
+                    'span.text-body-small.inline.t-black--light.break-words'),
+  connections:  txt("a[href*='connectionOf'] span, a[href*='connections'] span.t-bold"),
+  experience:   items('experience'),
+  education:    items('education'),
+  licenses:     items('licenses_and_certifications'),
+  volunteering: items('volunteering_experience'),
+  has_contact:  !!document.getElementById('top-card-text-details-contact-info'),
+};
+"""
+DATE_RE = re.compile(r"\b(?:19|20)\d{2}\b|\bpresent\b", re.I)
+NDU_RE  = re.compile(r"national defen[cs]e university|\bndu\b", re.I)
+# without these the DOM read is considered a miss and Vision fills the gaps
+REQUIRED = ("headline", "current_title", "current_company", "experience")
+
+def _roles(entries: List[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+    """Experience entries → (title, company, dates), newest first."""
+    out = []
+    for it in entries:
+        own = it["spans"]
+        grouped = [s for s in it["sub"] if any(DATE_RE.search(t) for t in s[1:])]
+        if grouped:                          # company header + one entry per role
+            for sub in grouped:
+                out.append((sub[0], own[0], next(t for t in sub[1:] if DATE_RE.search(t))))
+        elif len(own) >= 2:
+            out.append((own[0], own[1], next((t for t in own[2:] if DATE_RE.search(t)), "")))
+    return [(t, c.split(" · ")[0].strip(), d.split(" · ")[0].strip()) for t, c, d in out][:3]
+
+def dom_profile(driver: webdriver.Chrome) -> Dict[str, Any]:
+    """Every CSV field the DOM can give, as CSV-ready strings ('' when missing),
+    plus the has_contact flag."""
+    raw = driver.execute_script(PROFILE_JS) or {}
+    roles = _roles(raw.get("experience", []))
+    out = {k: raw.get(k, "") for k in ("profile_pic", "headline", "location", "connections")}
+    out["has_contact"] = raw.get("has_contact", True)
+    for (title, company, _), pre in zip(roles, ("current", "second", "third")):
+        out[f"{pre}_title"], out[f"{pre}_company"] = title, company
+    out["experience"] = "; ".join(
+        f"{t} @ {c} – {d}" if d else f"{t} @ {c}" for t, c, d in roles
+    )
+    out["education"] = "; ".join(
+        [it["spans"][0] for it in raw.get("education", []) if not NDU_RE.search(it["spans"][0])][:3]
+    )
+    out["licenses"] = "; ".join(it["spans"][0] for it in raw.get("licenses", [])[:3])
+    out["volunteering"] = "; ".join(
+        " @ ".join(it["spans"][:2]) for it in raw.get("volunteering", [])[:3]
+    )
+    return out
+
+def grab_email(driver: webdriver.Chrome) -> str:
+    """E-mail via the contact-info modal ('' when absent)."""
+    email = ""
     try:
-        driver.find_element(By.ID, "top-card-text-details-contact-info").click()
-        WebDriverWait(driver, WAIT_MODAL).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "section.artdeco-modal"))
+        driver.find_element(*CONTACT_LINK).click()
+        wait(driver, WAIT_MODAL).until(
+            EC.presence_of_element_located(MODAL)
         )
         try:
-            mail = driver.find_element(By.CSS_SELECTOR, "a[href^='mailto:']")
-            out["email"] = mail.get_attribute("href").replace("mailto:", "")
+            mail = driver.find_element(*MAIL_LINK)
+            email = mail.get_attribute("href").replace("mailto:", "")
         except NoSuchElementException:
             pass
         # close
         try:
-            driver.find_element(By.CSS_SELECTOR, "button[aria-label='Dismiss']").click()
+            driver.find_element(*DISMISS_BTN).click()
         except NoSuchElementException:
             pass
     except NoSuchElementException:
         pass
-    return out
+    return email
 
 # ── SCRAPER CORE ────────────────────────────────────────────────────────
-def scrape_profile(driver: webdriver.Chrome) -> Dict[str, Any]:
-    WebDriverWait(driver, WAIT_HEAD).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, "div.pv-text-details__left-panel"))
+def scrape_profile(driver: webdriver.Chrome, slug: str = "") -> Tuple[Dict[str, Any], Future]:
+    """DOM fields now, plus a future for the Vision fallback payload ({} when not needed)."""
+    wait(driver, WAIT_HEAD).until(
+        EC.presence_of_element_located(HEAD_PANEL)
     )
-    scroll_full_page(driver)
+    full_h = scroll_full_page(driver)
 
-    SHOTDIR.mkdir(exist_ok=True)
-    shot = SHOTDIR / f"{int(time.time()*1000)}.png"
-    driver.save_screenshot(str(shot))
+    dom = dom_profile(driver)
+    # no contact-info link → no click, no modal wait
+    dom["email"] = grab_email(driver) if dom.pop("has_contact") else ""
+    if not USE_VISION or all(dom.get(k) for k in REQUIRED):
+        return dom, resolved({})             # DOM had it all (or Vision is off) – no screenshot
 
-    dom = grab_dom_bits(driver)
-    vis = call_vision(shot)
-    # convert arrays to semicolon-strings for CSV
-    for key in ("experience", "education", "licenses", "volunteering"):
-        if key in vis and isinstance(vis[key], list):
-            vis[key] = "; ".join(vis[key])
-    return {**dom, **vis}
+    shot = capture_full_page(driver, full_h)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):  # keep shots only when debugging
+        SHOTDIR.mkdir(exist_ok=True)
+        io_pool.submit(_dump_shot, SHOTDIR / f"{int(time.time()*1000)}.jpg", shot)
+
+    if VISION_MODE == "batch" and slug:
+        vis = queue_vision(slug, shot)       # Vision columns filled in by apply_batch()
+    else:
+        vis = submit_vision(shot)
+    return dom, vis
+
+# ── WORKER POOL ─────────────────────────────────────────────────────────
+def _worker_init(email: str, pwd: str) -> None:
+    """Pool initializer – every worker thread owns one logged-in Chrome."""
+    start_worker(lambda i: init_driver(PROFILE_DIR / f"people_worker_{i}"), email, pwd, COOKIES)
+
+def scrape_one(row: Dict[str, str]) -> Tuple[Dict[str, Any], Future]:
+    """Scrape one input row on the calling worker's driver; Vision is left in flight."""
+    drv = worker_driver()
+    url = row["linkedin_profile"]
+    logging.info(f"→ {row['firstname']} {row['lastname']}")
+    try:
+        drv.get(url)
+        out = scrape_profile(drv, row["profile_slug"])
+    except (TimeoutException, WebDriverException) as e:  # skip failures
+        logging.error(f"{url} failed – {e}")
+        out = {}, resolved({})
+    polite_pause()
+    return out
 
 # ── MAIN RUN ────────────────────────────────────────────────────────────
 def main() -> None:
@@ -202,52 +433,48 @@ def main() -> None:
     email = os.getenv("LINKEDIN_EMAIL") or input("LinkedIn email: ").strip()
     pwd   = os.getenv("LINKEDIN_PASSWORD") or input("LinkedIn password: ").strip()
 
-    base_df = pd.read_csv(IN_CSV)
-    out_cols = list(base_df.columns) + [
+    # single pass over a small CSV – no DataFrame (dtype inference, blocks) needed
+    with IN_CSV.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    out_cols = list(reader.fieldnames or []) + [
         "current_title","current_company","second_title","second_company",
         "third_title","third_company","location","connections","headline",
         "profile_pic","email","experience","education","licenses","volunteering",
+        "profile_slug",
     ]
 
-    done: set[str] = set()
-    if OUT_CSV.exists():
-        done = set(pd.read_csv(OUT_CSV)["linkedin_profile"].dropna())
-        logging.info(f"Resuming – {len(done)} profiles done")
+    # OUT_CSV / DONE_TXT are shared with alumni_details_scraper.py
+    out_cols, done = load_done(OUT_CSV, DONE_TXT, out_cols)
 
-    OUT_CSV.parent.mkdir(exist_ok=True)
-    fout = OUT_CSV.open("a", newline="", encoding="utf-8")
-    writer = csv.DictWriter(fout, fieldnames=out_cols)
-    if not OUT_CSV.exists() or OUT_CSV.stat().st_size == 0:
-        writer.writeheader()
+    todo = []
+    for row in rows:
+        url = row.get("linkedin_profile") or ""
+        if url.startswith("http") and profile_slug(url) not in done:
+            row["profile_slug"] = profile_slug(url)
+            done.add(row["profile_slug"])    # also drops duplicate inputs
+            todo.append(row)
+    if not todo:
+        logging.info("Nothing left to scrape.")
+        if VISION_MODE == "batch":
+            apply_batch()                    # jobs from an interrupted run
+        return
 
-    drv = init_driver()
+    writer = open_output(OUT_CSV, DONE_TXT, out_cols)
     try:
-        linkedin_login(drv, email, pwd)
-        time.sleep(2)
-
-        for row in base_df.itertuples(index=False):
-            url = str(row.linkedin_profile)
-            if not url.startswith("http") or url in done:
-                continue
-
-            logging.info(f"→ {row.firstname} {row.lastname}")
-            try:
-                drv.get(url)
-                pdata = scrape_profile(drv)
-            except (TimeoutException, WebDriverException) as e:  # skip failures
-                logging.error(f"{url} failed – {e}")
-                pdata = {}
-
-            record = {**row._asdict(), **pdata}
-            writer.writerow(record)
-            fout.flush()
-            done.add(url)
-            time.sleep(1.5)
+        for row, (dom, vis) in run_workers(todo, scrape_one, lambda: _worker_init(email, pwd), WORKERS):
+            # non-empty DOM values win; Vision only fills the gaps
+            pdata = {**_flatten(vis.result()), **{k: v for k, v in dom.items() if v}}
+            writer.writerow(row, pdata)
 
     finally:
-        drv.quit()
-        fout.close()
+        quit_drivers()
+        io_pool.shutdown(wait=True)
+        writer.close()            # also reached on Ctrl‑C (KeyboardInterrupt)
         logging.info(f"Finished – {len(done)} profiles written to {OUT_CSV}")
 
+    if VISION_MODE == "batch":
+        apply_batch()
+
 if __name__ == "__main__":
     main()
@@ -1,7 +1,6 @@
-import os, time, json, base64, logging
-from io import BytesIO
+import os, time, json, base64, random, hashlib, asyncio, logging
 from pathlib import Path
-from PIL import Image
+from urllib.parse import urlsplit, parse_qs
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -11,6 +10,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+from openai_common import cache_get, cache_put, pooled_http_client
 from config import (
     TARGET_INSTITUTIONS,
     OUTPUT_SETTINGS,
@@ -30,10 +30,165 @@ if not OPENAI_API_KEY and OPENAI_SETTINGS.get("enabled", False):
     if not OPENAI_API_KEY:
         OPENAI_SETTINGS["enabled"] = False
 
+# Azure endpoint + api-version, parsed once from azure_api_url
+_azure = urlsplit(OPENAI_SETTINGS.get("azure_api_url", ""))
+AZURE_ENDPOINT = f"{_azure.scheme}://{_azure.netloc}"
+AZURE_API_VERSION = parse_qs(_azure.query).get("api-version", [""])[0]
+
+SHOT_FORMAT = "jpeg" if OPENAI_SETTINGS.get("image_format") == "jpeg" else "webp"
+SHOT_QUALITY = {"webp": 80, "jpeg": 85}[SHOT_FORMAT]
+
+VISION_RETRIES = 5
+VISION_BACKOFF_MAX = 30  # seconds
+TOKENS_PER_PAGE = 768    # ~10 cards of JSON per screenshot, with headroom
+VISION_PROMPT = (
+    "The images are LinkedIn search-result pages, numbered from 1 in the order given. "
+    "Extract every profile; image is the 1-based number of the image it appears in."
+)
+_CARD_KEYS = ("name", "job_title", "company", "location")
+# strict structured output – the reply is always exactly this shape, so it parses in one go
+PROFILES_SCHEMA = {
+    "name": "profiles",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "profiles": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "image": {"type": "integer"},
+                        **{k: {"type": "string"} for k in _CARD_KEYS},
+                    },
+                    "required": ["image", *_CARD_KEYS],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["profiles"],
+        "additionalProperties": False,
+    },
+}
+
+# Vision answers memoized by (prompt + schema, model, exact screenshots): reruns and
+# re-crawled pages never hit the API twice.
+_PROMPT_TAG = hashlib.sha1((VISION_PROMPT + json.dumps(PROFILES_SCHEMA)).encode()).hexdigest()[:8]
+
+
+def _cache_key(model: str, shots: list[str]) -> str:
+    h = hashlib.blake2b(model.encode(), digest_size=16)
+    for uri in shots:
+        h.update(uri.encode())
+    return f"{_PROMPT_TAG}_{h.hexdigest()}"
+
+
+class RateLimiter:
+    """Spaces acquisitions ≥ 1/rate seconds apart – one steady RPS however many workers run."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_vision_sem = asyncio.Semaphore(OPENAI_SETTINGS.get("concurrency", 5))  # global cap across workers
+_vision_rate = RateLimiter(OPENAI_SETTINGS.get("max_rate", 4))
+_linkedin_rate = RateLimiter(SEARCH_SETTINGS.get("max_rate", 0.5))  # keeps parallel sessions under the radar
+_vision_client = None
+
+
+def vision_client():
+    """(AsyncOpenAI | AsyncAzureOpenAI, model) – built once, shared by every worker."""
+    global _vision_client
+    if _vision_client is None:
+        from openai import AsyncOpenAI, AsyncAzureOpenAI
+        hx = pooled_http_client()
+        if OPENAI_SETTINGS.get("use_azure"):
+            client = AsyncAzureOpenAI(
+                api_key=OPENAI_API_KEY,
+                azure_endpoint=AZURE_ENDPOINT,
+                api_version=AZURE_API_VERSION,
+                http_client=hx,
+            )
+            model = OPENAI_SETTINGS["azure_deployment_id"]
+        else:
+            client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=hx)
+            model = OPENAI_SETTINGS.get("model", "gpt-4o-mini")
+        _vision_client = (client, model)
+    return _vision_client
+
+
+async def close_vision_client():
+    """Close the pooled connections on the loop that opened them."""
+    global _vision_client
+    if _vision_client is not None:
+        await _vision_client[0].close()
+        _vision_client = None
+
+
+def by(sel: str) -> tuple[str, str]:
+    """Locator tuple for a config selector – XPath if it starts with '//', else CSS."""
+    return (By.XPATH, sel) if sel.startswith("//") else (By.CSS_SELECTOR, sel)
+
+
+# href of the first profile link on the current results page (CSS selectors only)
+FIRST_HREF_JS = """
+const a = arguments[0].map(s => document.querySelector(s)).find(Boolean);
+return a ? a.href : null;
+"""
+# config selectors resolved to locators / CSS-only lists once at import
+NEXT_BUTTON_LOCATORS = tuple(by(s) for s in LINKEDIN_SELECTORS["next_page_button"])
+RESULTS_LOCATORS = tuple(by(s) for s in LINKEDIN_SELECTORS["search_results"])
+RESULTS_CSS = [s for s in LINKEDIN_SELECTORS["search_results"] if not s.startswith("//")]
+NEXT_BUTTON_CSS = [s for s in LINKEDIN_SELECTORS["next_page_button"] if not s.startswith("//")]
+
+# true when a Next button is rendered but disabled – i.e. this is the last page
+LAST_PAGE_JS = """
+const b = arguments[0].map(s => document.querySelector(s)).find(Boolean);
+return !!b && (b.disabled || b.getAttribute('aria-disabled') === 'true');
+"""
+NEXT_WAIT = 1   # seconds – the button is rendered with the list, it does not trickle in later
+PROFILE_LINK_CSS = [s for s in LINKEDIN_SELECTORS["profile_links"] if not s.startswith("//")]
+
+RESULT_CARD_CSS = "li.reusable-search__result-container"
+CARD_COUNT_JS = f"return document.querySelectorAll({RESULT_CARD_CSS!r}).length;"
+STABLE_POLL = 0.2           # seconds between card counts while the list is still filling in
+EMPTY_STABLE_READS = 5      # an empty list must stay empty this many polls before we believe it
+
+# every result card's text fields in one round-trip; headline "Title at Company" is split in Python
+CARDS_JS = """
+const txt = (root, sel) => (root.querySelector(sel)?.innerText || "").trim();
+return [...document.querySelectorAll(arguments[0])].map(li => ({
+  name:     txt(li, ".entity-result__title-text a span[aria-hidden='true']"),
+  headline: txt(li, ".entity-result__primary-subtitle"),
+  location: txt(li, ".entity-result__secondary-subtitle"),
+  url:      (li.querySelector(".entity-result__title-text a")?.href || "").split("?")[0],
+}));
+"""
+
+
+_DIRS_READY: set[str] = set()
+NDJSON_OUT = (Path("output") / OUTPUT_SETTINGS["json_filename"]).with_suffix(".ndjson")
+PROFILE_ROOT = Path("chrome_profile")   # one persisted Chrome profile per search worker
+MAX_WORKERS = 3                         # more parallel logins start to look like a bot to LinkedIn
+
 
 class AlumniScraper:
-    def __init__(self, email: str, password: str):
+    def __init__(self, email: str, password: str, profile_dir: Path | None = None):
         self.email, self.password, self.driver = email, password, None
+        self.profile_dir = profile_dir
 
     # ── driver ──────────────────────────────────────────────────────────────
     def initialize_driver(self) -> bool:
@@ -41,6 +196,11 @@ class AlumniScraper:
             opts = Options()
             opts.add_argument("--start-maximized")
             opts.add_argument("--disable-notifications")
+            if self.profile_dir:  # own user-data-dir: no profile lock clash, session survives reruns
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                opts.add_argument(f"--user-data-dir={self.profile_dir.resolve()}")
+                opts.add_argument("--profile-directory=Default")
+            opts.page_load_strategy = "eager"
             self.driver = webdriver.Chrome(options=opts)  # Selenium‑Manager
             logging.info("ChromeDriver initialized")
             return True
@@ -51,6 +211,16 @@ class AlumniScraper:
     # ── login ───────────────────────────────────────────────────────────────
     def login(self) -> bool:
         try:
+            # a persisted profile usually still holds a session – then no login form at all
+            self.driver.get("https://www.linkedin.com/feed/")
+            try:
+                WebDriverWait(self.driver, 3).until(
+                    EC.presence_of_element_located((By.XPATH, '//input[contains(@placeholder,"Search")]'))
+                )
+                logging.info("Session still valid – login skipped")
+                return True
+            except TimeoutException:
+                pass
             self.driver.get("https://www.linkedin.com/login")
             WebDriverWait(self.driver, 15).until(EC.presence_of_element_located((By.ID, "username")))
             self.driver.find_element(By.ID, "username").send_keys(self.email)
@@ -74,119 +244,312 @@ class AlumniScraper:
                 f"?keywords={query}&origin=SWITCH_SEARCH_VERTICAL"
             )
             self.driver.get(url)
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "main"))
-            )
+            self.wait_results()
             return True
         except Exception as e:
             logging.error(f"Search error for {inst}: {e}")
             return False
 
+    def wait_results(self):
+        """Block until the results list is present *and* its card count has settled."""
+        w = WebDriverWait(self.driver, SEARCH_SETTINGS["timeout_wait"], poll_frequency=STABLE_POLL)
+        w.until(lambda d: any(d.find_elements(*loc) for loc in RESULTS_LOCATORS))
+
+        state = {"n": -1, "same": 0}
+
+        def settled(d) -> bool:
+            n = d.execute_script(CARD_COUNT_JS)
+            state["same"] = state["same"] + 1 if n == state["n"] else 0
+            state["n"] = n
+            return state["same"] >= (1 if n else EMPTY_STABLE_READS)
+
+        w.until(settled)
+
+
+# document-space box of the search-results list (CSS selectors only); null until it has rendered
+RESULTS_RECT_JS = """
+const el = arguments[0].map(s => document.querySelector(s)).find(Boolean);
+if (!el) return null;
+const r = el.getBoundingClientRect();
+if (!r.width || !r.height) return null;
+return {x: r.left + window.scrollX, y: r.top + window.scrollY,
+        w: r.width, h: r.height, dpr: window.devicePixelRatio || 1};
+"""
+SNAP_ATTEMPTS = 3
+
+
+def page_signature(cards: list[dict], shot: str | None) -> bytes | None:
+    """Cheap fingerprint of a results page – its profile URLs, else its screenshot."""
+    if any(c["profile_url"] for c in cards):
+        data = "\n".join(c["profile_url"] for c in cards).encode()
+    elif shot:
+        data = shot.encode()
+    else:
+        return None
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def results_clip(rect: dict) -> dict:
+    """CDP clip for the results list, scaled so it is ≤ vision_max_width pixels wide.
+
+    The list is a tall strip – clamping the long edge would shrink the text
+    column to a few hundred pixels, so only the width is bounded.
+    """
+    width = OPENAI_SETTINGS.get("vision_max_width", 768)
+    scale = min(1.0, width / (max(rect["w"], 1) * rect["dpr"]))
+    return {"x": rect["x"], "y": rect["y"], "width": rect["w"], "height": rect["h"], "scale": scale}
+
 
 class ScreenshotAlumniScraper(AlumniScraper):
     # dirs --------------------------------------------------
     @staticmethod
     def _ensure_dir(p: str | Path):
-        Path(p).mkdir(parents=True, exist_ok=True)
+        if (key := str(p)) not in _DIRS_READY:  # mkdir once per process, not per page
+            Path(p).mkdir(parents=True, exist_ok=True)
+            _DIRS_READY.add(key)
 
     # screenshot -------------------------------------------
-    def snap(self, fname: str) -> str:
-        self._ensure_dir("screenshots")
-        path = Path("screenshots") / fname
-        self.driver.save_screenshot(str(path))
-        return str(path)
+    def snap(self, fname: str) -> str | None:
+        """Results-list WebP/JPEG as a data URI – Chrome clips, downscales + encodes it, no PIL round-trip.
+
+        None when the results list never yields a box – the page is skipped rather
+        than sending a whole-window shot to Vision.
+        """
+        for attempt in range(SNAP_ATTEMPTS):
+            try:
+                rect = self.driver.execute_script(RESULTS_RECT_JS, RESULTS_CSS)
+                if rect:
+                    b64 = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+                        "format": SHOT_FORMAT,
+                        "quality": SHOT_QUALITY,
+                        "captureBeyondViewport": True,
+                        "clip": results_clip(rect),
+                    })["data"]
+                    break
+            except WebDriverException as e:
+                logging.debug(f"Snap attempt {attempt + 1} failed – {e}")
+            if attempt < SNAP_ATTEMPTS - 1:   # no back-off once the last attempt has failed
+                time.sleep(0.5 * 2 ** attempt)
+        else:
+            logging.warning(f"No results list to capture for {fname} – page skipped")
+            return None
+        if logging.getLogger().isEnabledFor(logging.DEBUG):  # keep a copy only when debugging
+            self._ensure_dir("screenshots")
+            (Path("screenshots") / fname).with_suffix(f".{SHOT_FORMAT}").write_bytes(base64.b64decode(b64))
+        return f"data:image/{SHOT_FORMAT};base64," + b64  # the only copy kept until Vision sends it
+
+    # DOM --------------------------------------------------
+    def dom_cards(self) -> list[dict]:
+        """Result cards as {name, job_title, company, location, profile_url} straight from the DOM."""
+        cards = []
+        for c in self.driver.execute_script(CARDS_JS, RESULT_CARD_CSS) or []:
+            title, _, company = c["headline"].partition(" at ")
+            cards.append({"name": c["name"], "job_title": title.strip(), "company": company.strip(),
+                          "location": c["location"], "profile_url": c["url"]})
+        return cards
 
     # vision -----------------------------------------------
-    def vision_extract(self, img_path: str) -> list[dict]:
-        if not (OPENAI_SETTINGS.get("enabled") and OPENAI_API_KEY):
+    async def vision_extract(self, shots: list[str]) -> list[dict]:
+        """One request for several page screenshots – shared prompt, one round trip."""
+        if not (shots and OPENAI_SETTINGS.get("enabled") and OPENAI_API_KEY):
             return []
-        from openai import OpenAI, AzureOpenAI
-        if OPENAI_SETTINGS.get("use_azure"):
-            client = AzureOpenAI(
-                api_key=OPENAI_API_KEY,
-                azure_endpoint=OPENAI_SETTINGS["azure_api_url"].split("/openai")[0],
-                api_version=OPENAI_SETTINGS["azure_api_url"].split("api-version=")[1],
-            )
-            model = OPENAI_SETTINGS["azure_deployment_id"]
-        else:
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            model = OPENAI_SETTINGS.get("model", "gpt-4o-mini")
+        from openai import APIConnectionError, APIStatusError
+        client, model = vision_client()
+        key = _cache_key(model, shots)
+        if (hit := cache_get(key)) is not None:
+            logging.debug(f"Vision cache hit ({key[:16]})")
+            return hit["profiles"]
+        detail = OPENAI_SETTINGS.get("detail", "auto")
+        # built once: every retry below re-sends these same data URIs, nothing is re-read or re-encoded
+        content = [{"type": "text", "text": VISION_PROMPT}] + [
+            {"type": "image_url", "image_url": {"url": uri, "detail": detail}}
+            for uri in shots
+        ]
 
-        with open(img_path, "rb") as f:
-            b64 = base64.b64encode(f.read()).decode()
-
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": 'Extract JSON array "profiles" with keys [name, job_title, company, location].'},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{b64}"}}]},
-            ],
-            max_tokens=512,
-            temperature=0,
-        )
+        for attempt in range(VISION_RETRIES):
+            try:
+                async with _vision_rate, _vision_sem:
+                    resp = await client.chat.completions.create(
+                        model=model,
+                        messages=[{"role": "user", "content": content}],
+                        response_format={"type": "json_schema", "json_schema": PROFILES_SCHEMA},
+                        max_tokens=TOKENS_PER_PAGE * len(shots),
+                        temperature=0,
+                    )
+                break
+            except (APIConnectionError, APIStatusError) as e:
+                # 429 / 5xx / network blips are transient – anything else (400, 401 …) will not heal
+                status = getattr(e, "status_code", None)
+                if status is not None and status != 429 and status < 500:
+                    logging.error(f"Vision failed ({status}) – {e}")
+                    return []
+                if attempt == VISION_RETRIES - 1:
+                    logging.error(f"Vision still failing ({status or 'network'}) – giving up on {len(shots)} page(s)")
+                    return []
+                delay = min(2 ** (attempt + 1), VISION_BACKOFF_MAX) + random.random()
+                logging.warning(f"Vision {status or 'network'} error – retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)  # back off outside the semaphore
+        if resp.choices[0].finish_reason == "length" and len(shots) > 1:
+            # truncated JSON would lose the whole batch – split it and renumber the second half
+            mid = len(shots) // 2
+            head, tail = await asyncio.gather(self.vision_extract(shots[:mid]), self.vision_extract(shots[mid:]))
+            for pr in tail:
+                pr["image"] = pr.get("image", 1) + mid
+            return head + tail
+        msg = resp.choices[0].message
+        if getattr(msg, "refusal", None):  # strict mode signals a refusal instead of bad JSON
+            logging.warning(f"Vision refused {len(shots)} page(s): {msg.refusal}")
+            return []
         try:
-            txt = resp.choices[0].message.content
-            data = json.loads(txt.split("```")[-2] if "```" in txt else txt)
-            return data["profiles"] if isinstance(data, dict) else data
+            result = json.loads(msg.content)
+            profiles = result["profiles"]
         except Exception as e:
             logging.error(f"Vision parse error: {e}")
             return []
+        cache_put(key, result)
+        return profiles
 
     # pagination -------------------------------------------
     def click_next(self) -> bool:
-        for sel in LINKEDIN_SELECTORS["next_page_button"]:
-            try:
-                btn = WebDriverWait(self.driver, 4).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, sel) if not sel.startswith("//") else (By.XPATH, sel))
+        """Click "Next" and return as soon as the first result on the page has changed."""
+        if self.driver.execute_script(LAST_PAGE_JS, NEXT_BUTTON_CSS):
+            return False  # last page – no wait at all
+        try:  # one short wait for whichever variant is clickable
+            btn = WebDriverWait(self.driver, NEXT_WAIT).until(
+                EC.any_of(*(EC.element_to_be_clickable(loc) for loc in NEXT_BUTTON_LOCATORS))
+            )
+        except TimeoutException:
+            return False
+
+        old = self.driver.execute_script(FIRST_HREF_JS, PROFILE_LINK_CSS)
+        btn.click()
+        try:
+            if old:  # the results list re-renders in place – wait for a different first profile
+                WebDriverWait(self.driver, SEARCH_SETTINGS["timeout_wait"]).until(
+                    lambda d: d.execute_script(FIRST_HREF_JS, PROFILE_LINK_CSS) not in (None, old)
                 )
-                btn.click()
-                time.sleep(SEARCH_SETTINGS["page_load_delay"])
-                return True
-            except Exception:
-                continue
-        return False
+            self.wait_results()
+            return True
+        except TimeoutException:
+            logging.warning("Next page did not load – stopping pagination")
+            return False
 
-    def page_profiles(self, inst: str, pno: int) -> list[dict]:
-        shot = self.snap(f"{inst.replace(' ', '_')}_p{pno}.png")
-        profs = self.vision_extract(shot)
+    async def page_profiles(self, inst: str, pnos: list[int], shots: list[str]) -> list[dict]:
+        profs = await self.vision_extract(shots)
         for pr in profs:
-            pr["searched_institution"], pr["page_found"] = inst, pno
+            try:
+                idx = min(max(int(pr.pop("image", 1)) - 1, 0), len(pnos) - 1)
+            except (TypeError, ValueError):
+                idx = 0
+            pr["searched_institution"], pr["page_found"] = inst, pnos[idx]
         return profs
 
     # crawl ------------------------------------------------
-    def crawl_inst(self, inst: str) -> list[dict]:
-        if not self.search_for_institution(inst):
-            return []
-        time.sleep(SEARCH_SETTINGS["page_load_delay"])
-        collected = []
+    async def crawl_inst(self, inst: str) -> list[dict]:
+        """Selenium is blocking – every driver call runs in a thread so sessions overlap."""
+        async with _linkedin_rate:
+            if not await asyncio.to_thread(self.search_for_institution, inst):
+                return []
+        per_call = max(1, OPENAI_SETTINGS.get("pages_per_call", 4))
+        vision_on = bool(OPENAI_SETTINGS.get("enabled") and OPENAI_API_KEY)
+        dom_first = OPENAI_SETTINGS.get("only_when_dom_fails", True)
+        found, calls, pnos, shots = [], [], [], []  # Vision runs in the background while the driver keeps paginating
+        last_sig = None
         for p in range(1, SEARCH_SETTINGS["max_pages_per_institution"] + 1):
             logging.info(f"{inst}: page {p}")
-            collected.extend(self.page_profiles(inst, p))
-            if not self.click_next():
+            cards = await asyncio.to_thread(self.dom_cards)
+            complete = cards and all(c["name"] and c["job_title"] for c in cards)
+            dom_page = bool(cards) and (not vision_on or (dom_first and complete))
+            # with Vision off a screenshot has no reader – never capture one
+            shot = None if dom_page or not vision_on else await asyncio.to_thread(
+                self.snap, f"{inst.replace(' ', '_')}_p{p}.png"
+            )
+
+            # pagination that silently did not move would bill Vision for the same page again
+            sig = page_signature(cards, shot)
+            if sig is not None and sig == last_sig:
+                logging.warning(f"{inst}: page {p} repeats page {p - 1} – stopping this institution")
                 break
-        return collected
+            last_sig = sig
 
-    def run_with_screenshots(self):
-        if not (self.initialize_driver() and self.login()):
-            return
-        all_p = []
+            if dom_page:
+                for c in cards:  # text already on the page – no screenshot, no Vision call
+                    c["searched_institution"], c["page_found"] = inst, p
+                found.extend(cards)
+            elif shot:
+                pnos.append(p)
+                shots.append(shot)
+            async with _linkedin_rate:
+                last = not await asyncio.to_thread(self.click_next)
+            # send as soon as no Vision call is in flight – batches only build up while one is
+            idle = all(t.done() for t in calls)
+            if shots and (len(shots) == per_call or last or idle):
+                calls.append(asyncio.create_task(self.page_profiles(inst, pnos, shots)))
+                pnos, shots = [], []
+            if last:
+                break
+        if shots:  # hit max_pages with a partial batch
+            calls.append(asyncio.create_task(self.page_profiles(inst, pnos, shots)))
+        return found + [pr for profs in await asyncio.gather(*calls) for pr in profs]
+
+    async def _crawl_all(self):
+        """One logged-in driver per worker; workers pull institutions off a shared queue."""
+        queue: asyncio.Queue[str] = asyncio.Queue()
         for inst in TARGET_INSTITUTIONS:
-            all_p.extend(self.crawl_inst(inst))
-            self.save(all_p)
-            time.sleep(SEARCH_SETTINGS["delay_between_profiles"])
-        if self.driver:
-            self.driver.quit()
+            queue.put_nowait(inst)
+        lock = asyncio.Lock()
+        self._ensure_dir("output")
+        NDJSON_OUT.unlink(missing_ok=True)  # fresh run – records are appended as institutions finish
+
+        async def worker(wid: int):
+            bot = type(self)(self.email, self.password, PROFILE_ROOT / f"search_w{wid}")
+            if not (await asyncio.to_thread(bot.initialize_driver) and await asyncio.to_thread(bot.login)):
+                return
+            try:
+                while not queue.empty():
+                    inst = queue.get_nowait()
+                    profs = await bot.crawl_inst(inst)
+                    async with lock:
+                        await asyncio.to_thread(self.append, profs)
+                    await asyncio.sleep(SEARCH_SETTINGS["delay_between_profiles"])
+            finally:
+                if bot.driver:
+                    await asyncio.to_thread(bot.driver.quit)
+
+        n = max(1, min(SEARCH_SETTINGS.get("workers", 3), MAX_WORKERS, len(TARGET_INSTITUTIONS)))
+        try:
+            await asyncio.gather(*(worker(i) for i in range(n)))
+        finally:
+            await close_vision_client()
+            self.finalize()
+
+    def run_with_screenshots(self):
+        asyncio.run(self._crawl_all())
 
     # save -------------------------------------------------
-    def save(self, data: list[dict]):
+    @staticmethod
+    def append(profs: list[dict]):
+        """Each record is written exactly once – no rewrite of everything so far."""
+        if not profs:
+            return
+        with NDJSON_OUT.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(p) + "\n" for p in profs)
+        logging.info(f"Appended {len(profs)} profiles → {NDJSON_OUT}")
+
+    @staticmethod
+    def finalize():
+        """Turn the NDJSON log into the legacy indented JSON once, at the end of the run."""
+        if not NDJSON_OUT.exists():
+            return
+        with NDJSON_OUT.open(encoding="utf-8") as f:
+            data = [json.loads(line) for line in f if line.strip()]
         if not data:
             return
-        self._ensure_dir("output")
         out = Path("output") / OUTPUT_SETTINGS["json_filename"]
-        out.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp = out.with_suffix(".json.tmp")  # write aside + rename – a crash never truncates the last good file
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, out)
         logging.info(f"Saved {len(data)} profiles → {out}")
 
 
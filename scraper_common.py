@@ -0,0 +1,350 @@
+"""
+scraper_common.py  ⟶  machinery shared by the two profile-detail scrapers
+──────────────────────────────────────────────────────────────────────────────
+Used by alumni_details_scraper.py and people_alumni_scraper.py, which read the
+same input and write the same OUT_CSV / resume sidecar (the Vision cache they
+also share lives in openai_common.py):
+
+• the background event loop every Vision request runs on
+• the OpenAI Batch API queue (VISION_MODE=batch) and the merge into the CSV
+• Selenium login / cookie sharing and the Chrome worker pool
+• BatchedWriter – the single CSV writer with its flush + fsync resume rule
+──────────────────────────────────────────────────────────────────────────────
+"""
+
+from __future__ import annotations
+import os, csv, time, json, random, pickle, logging, threading, itertools, asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# ───────────────────────────── config ────────────────────────────────────
+BATCH_MAX_BYTES = 190 * 2**20   # API caps a Batch input file at 200 MB
+BATCH_POLL      = 60
+POLL       = 0.05           # WebDriverWait poll interval
+SEARCH_BOX = (By.XPATH, "//input[contains(@placeholder,'Search')]")   # logged-in marker
+
+# ─────────────────────────── OpenAI Vision ───────────────────────────────
+# One event loop shared by all worker threads: Chrome workers hand over their
+# Vision calls and move on to the next profile while the answers are pending.
+vision_loop = asyncio.new_event_loop()
+threading.Thread(target=vision_loop.run_forever, name="vision-loop", daemon=True).start()
+
+
+def run_async(coro) -> Future:
+    """Schedule *coro* on :data:`vision_loop`; ``.result()`` blocks for its value."""
+    return asyncio.run_coroutine_threadsafe(coro, vision_loop)
+
+
+def resolved(value: Any) -> Future:
+    """A future that already holds *value* – for answers known without a request."""
+    fut: Future = Future()
+    fut.set_result(value)
+    return fut
+
+
+# ─────────────────── OpenAI Batch API (VISION_MODE=batch) ────────────────
+
+class BatchQueue:
+    """chat.completions requests queued to JSONL while scraping, sent as Batch jobs after.
+
+    Batch runs trade latency (answers within 24 h) for half the price. *sent*
+    holds the ids of submitted, not yet merged jobs, so an interrupted run
+    resumes polling them instead of submitting the queue again.
+    """
+
+    def __init__(self, queue: Path, sent: Path):
+        self.queue, self.sent = queue, sent
+        self._lock = threading.Lock()
+
+    def pending(self) -> bool:
+        return self.queue.exists() or self.sent.exists()
+
+    def add(self, requests: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Append (custom_id, request body) pairs to the queue."""
+        lines = [
+            json.dumps({"custom_id": cid, "method": "POST", "url": "/v1/chat/completions", "body": body})
+            for cid, body in requests
+        ]
+        if not lines:
+            return
+        with self._lock:
+            self.queue.parent.mkdir(exist_ok=True)
+            with self.queue.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def _split(self) -> List[bytes]:
+        """The queue cut into upload‑sized parts on line boundaries."""
+        parts, cur, size = [], [], 0
+        with self.queue.open("rb") as f:
+            for line in f:
+                if cur and size + len(line) > BATCH_MAX_BYTES:
+                    parts.append(b"".join(cur))
+                    cur, size = [], 0
+                cur.append(line)
+                size += len(line)
+        if cur:
+            parts.append(b"".join(cur))
+        return parts
+
+    @staticmethod
+    async def _submit(client, part: bytes) -> str:
+        up = await client.files.create(file=("batch.jsonl", part), purpose="batch")
+        job = await client.batches.create(
+            input_file_id=up.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        logging.info(f"Batch {job.id} submitted ({len(part) / 2**20:.1f} MB)")
+        return job.id
+
+    async def _run(self, client) -> List[Tuple[str, Dict[str, Any]]]:
+        ids = self.sent.read_text().split() if self.sent.exists() else []
+        if not ids and self.queue.exists():
+            ids = [await self._submit(client, part) for part in self._split()]
+            self.sent.write_text("\n".join(ids))
+            self.queue.unlink()
+
+        out: List[Tuple[str, Dict[str, Any]]] = []
+        for job_id in ids:
+            job = await client.batches.retrieve(job_id)
+            while job.status not in ("completed", "failed", "expired", "cancelled"):
+                logging.info(f"Batch {job_id} {job.status} – next check in {BATCH_POLL}s")
+                await asyncio.sleep(BATCH_POLL)
+                job = await client.batches.retrieve(job_id)
+            if not job.output_file_id:
+                logging.error(f"Batch {job_id} {job.status} – no output")
+                continue
+            content = await client.files.content(job.output_file_id)
+            for line in content.text.splitlines():
+                rec = json.loads(line)
+                try:
+                    msg = rec["response"]["body"]["choices"][0]["message"]["content"]
+                    out.append((rec["custom_id"], json.loads(msg)))
+                except (KeyError, IndexError, TypeError, json.JSONDecodeError) as e:
+                    logging.warning(f"{rec.get('custom_id')} failed – {rec.get('error') or e}")
+        return out
+
+    def results(self, client) -> List[Tuple[str, Dict[str, Any]]]:
+        """Submit the queue (or resume jobs already sent), wait, return (custom_id, payload) pairs."""
+        return run_async(self._run(client)).result()
+
+    def merged(self) -> None:
+        """Forget the sent jobs once their answers are safely in the CSV."""
+        self.sent.unlink(missing_ok=True)
+
+
+def fill_csv(path: Path, merged: Dict[str, Dict[str, Any]]) -> None:
+    """Fill the still‑empty columns of *path* from *merged* ({profile_slug: fields}).
+
+    DOM values already in a row win, exactly as in live mode; the file is
+    rewritten aside and renamed, so a crash never truncates it.
+    """
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    for row in rows:
+        for k, v in merged.get(profile_slug(row.get("linkedin_profile", "")), {}).items():
+            if not row.get(k):
+                row[k] = v
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=reader.fieldnames, extrasaction="ignore")
+        w.writeheader()
+        w.writerows(rows)
+    os.replace(tmp, path)
+
+
+def profile_slug(url: str) -> str:
+    """Canonical '/in/<name>' key – ignores scheme, 'www.', query string and trailing '/'."""
+    return url.split("?")[0].split("#")[0].rstrip("/").split("linkedin.com")[-1].lower()
+
+# ───────────────────────── Selenium helpers ─────────────────────────────
+# Every scraper's Chrome runs with page_load_strategy = "eager": get() returns at
+# DOMContentLoaded and the explicit waits (wait() below) do the real syncing, so
+# trackers, beacons and fonts no longer hold up every navigation.
+
+def wait(drv: webdriver.Chrome, timeout: float) -> WebDriverWait:
+    """WebDriverWait polling every POLL s – the 0.5 s default is dead time on a local driver."""
+    return WebDriverWait(drv, timeout, poll_frequency=POLL)
+
+
+def is_logged_in(drv: webdriver.Chrome) -> bool:
+    """True when the persisted Chrome profile still holds a LinkedIn session."""
+    drv.get("https://www.linkedin.com/feed/")
+    try:
+        wait(drv, 5).until(EC.presence_of_element_located(SEARCH_BOX))
+        return True
+    except TimeoutException:
+        return False
+
+
+def linkedin_login(drv: webdriver.Chrome, email: str, pwd: str) -> None:
+    drv.get("https://www.linkedin.com/login")
+    wait(drv, 20).until(EC.presence_of_element_located((By.ID, "username")))
+    drv.find_element(By.ID, "username").send_keys(email)
+    drv.find_element(By.ID, "password").send_keys(pwd)
+    drv.find_element(By.XPATH, "//button[@type='submit']").click()
+    wait(drv, 20).until(EC.presence_of_element_located(SEARCH_BOX))
+    logging.info("✔ Logged in.")
+
+
+def restore_cookies(drv: webdriver.Chrome, cookies: Path) -> bool:
+    """Adopt the pickled session of an earlier login; True when that logs us in."""
+    if not cookies.exists():
+        return False
+    drv.get("https://www.linkedin.com/")
+    for c in pickle.loads(cookies.read_bytes()):
+        try:
+            drv.add_cookie(c)
+        except WebDriverException:
+            continue
+    return is_logged_in(drv)
+
+# ───────────────────────────── worker pool ───────────────────────────────
+_local = threading.local()
+_drivers: List[webdriver.Chrome] = []
+_drivers_lock = threading.Lock()
+_worker_ids = itertools.count()
+_login_lock = threading.Lock()
+
+
+def start_worker(
+    make_driver: Callable[[int], webdriver.Chrome], email: str, pwd: str, cookies: Path
+) -> None:
+    """Pool initializer body – the calling thread gets its own logged‑in Chrome.
+
+    *make_driver* receives the worker number (for a per‑worker profile dir).
+    Only one real login happens for the pool; later workers adopt its cookies.
+    """
+    drv = make_driver(next(_worker_ids))
+    with _drivers_lock:
+        _drivers.append(drv)
+    if is_logged_in(drv):
+        logging.info("✔ Reusing saved session.")
+    else:
+        with _login_lock:
+            if restore_cookies(drv, cookies):
+                logging.info("✔ Reusing pickled session.")
+            else:
+                linkedin_login(drv, email, pwd)
+                cookies.parent.mkdir(exist_ok=True)
+                cookies.write_bytes(pickle.dumps(drv.get_cookies()))
+    _local.drv = drv
+
+
+def worker_driver() -> webdriver.Chrome:
+    """The Chrome owned by the calling worker thread."""
+    return _local.drv
+
+
+def quit_drivers() -> None:
+    for drv in _drivers:
+        drv.quit()
+
+
+def polite_pause() -> None:
+    """Jitter between profiles – politeness only, the scrapers wait explicitly."""
+    time.sleep(random.uniform(0.3, 0.8))
+
+
+def run_workers(
+    todo: List[Dict[str, str]],
+    work: Callable[[Dict[str, str]], Any],
+    init: Callable[[], None],
+    workers: int,
+) -> Iterator[Tuple[Dict[str, str], Any]]:
+    """Yield (row, work(row)) as the pool finishes them.
+
+    Workers only scrape; the consuming thread is the single CSV writer, so
+    rows never interleave.
+    """
+    with ThreadPoolExecutor(max_workers=min(workers, len(todo)), initializer=init) as pool:
+        futures = {pool.submit(work, r): r for r in todo}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+# ───────────────────────────── CSV output ────────────────────────────────
+
+def load_done(out_csv: Path, done_txt: Path, out_cols: List[str]) -> Tuple[List[str], set[str]]:
+    """Resume state of *out_csv*: (column layout to append with, profile slugs done).
+
+    The sidecar is only trusted next to a non‑empty CSV, and an existing header
+    keeps its layout. Without a sidecar it is seeded from the CSV once.
+    """
+    done: set[str] = set()
+    if out_csv.exists() and out_csv.stat().st_size:
+        with out_csv.open(newline="", encoding="utf-8") as f:
+            rd = csv.reader(f)               # one column by index – no full-frame parse
+            out_cols = next(rd, out_cols)
+            if done_txt.exists():
+                done = set(done_txt.read_text(encoding="utf-8").split())
+            else:
+                i = out_cols.index("linkedin_profile")
+                done = {profile_slug(r[i]) for r in rd if len(r) > i and r[i]}
+                done_txt.write_text("".join(f"{d}\n" for d in done), encoding="utf-8")
+        logging.info(f"Resuming – {len(done)} already done.")
+    return out_cols, done
+
+
+def open_output(out_csv: Path, done_txt: Path, out_cols: List[str]) -> BatchedWriter:
+    """BatchedWriter appending to *out_csv*, header written when the file is new."""
+    out_csv.parent.mkdir(exist_ok=True)
+    new_file = not out_csv.exists() or out_csv.stat().st_size == 0
+    fout = out_csv.open("a", newline="", encoding="utf-8")
+    # a fresh CSV starts a fresh resume set – stale slugs would skip every profile
+    done_f = done_txt.open("w" if new_file else "a", encoding="utf-8")
+    writer = BatchedWriter(fout, out_cols, done_f=done_f)
+    if new_file:
+        writer.writeheader()
+    return writer
+
+
+class BatchedWriter:
+    """csv.writer that flushes + fsyncs every *every* rows or *interval* seconds.
+
+    Rows are laid out once against the column tuple – no per‑row dict merge.
+    A crash loses at most one batch – those profiles are simply re‑scraped on resume.
+    The slugs of a batch go to *done_f* only after its rows are on disk.
+    """
+
+    def __init__(self, fout, fieldnames: List[str], every: int = 10, interval: float = 5.0, done_f=None):
+        self.fout = fout
+        self.done_f = done_f
+        self.cols = tuple(fieldnames)
+        self.writer = csv.writer(fout)
+        self.every, self.interval = every, interval
+        self.buf: List[Tuple[Any, ...]] = []
+        self.slugs: List[str] = []
+        self.last_flush = time.monotonic()
+
+    def writeheader(self) -> None:
+        self.writer.writerow(self.cols)
+
+    def writerow(self, base: Dict[str, Any], extra: Dict[str, Any]) -> None:
+        """One output row: *extra* (scraped data) wins over *base* (input columns)."""
+        self.buf.append(tuple(extra[c] if c in extra else base.get(c, "") for c in self.cols))
+        self.slugs.append(base.get("profile_slug", ""))
+        if len(self.buf) >= self.every or time.monotonic() - self.last_flush > self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self.writer.writerows(self.buf)
+        self.fout.flush()
+        os.fsync(self.fout.fileno())
+        if self.done_f is not None and self.slugs:
+            self.done_f.write("".join(f"{slug}\n" for slug in self.slugs))
+            self.done_f.flush()
+        self.buf.clear()
+        self.slugs.clear()
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self.fout.close()
+        if self.done_f is not None:
+            self.done_f.close()
@@ -4,8 +4,12 @@ import logging
 import csv
 import time
 import json
+import shelve
+import hashlib
+from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
@@ -41,6 +45,72 @@ logging.getLogger('selenium').setLevel(logging.WARNING)
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 logging.getLogger('webdriver_manager').setLevel(logging.WARNING)
 
+HEADLESS = os.getenv("SCRAPER_HEADLESS", "1") != "0"   # 0 → visible window for debugging
+TARGETS_LC = tuple(t.lower() for t in TARGET_INSTITUTIONS)   # lowered once for matching
+
+# Accepted profiles are remembered across runs so a person who shows up under
+# several institutions (or in a rerun) is only opened once. One db per target
+# list, since it decides which education entries are kept; rejections are never
+# stored, so a partial DOM read is simply retried next time.
+_TARGETS_TAG = hashlib.sha1("|".join(TARGETS_LC).encode()).hexdigest()[:8]
+PROFILE_CACHE = Path(f"cache/profiles_{_TARGETS_TAG}.db")
+PROFILE_CACHE_TTL = 30 * 86400      # seconds a cached profile stays valid
+
+
+def matches_target(school):
+    """True if any target institution occurs in *school* (case-insensitive)."""
+    school_lc = school.lower()
+    return any(target in school_lc for target in TARGETS_LC)
+
+
+# Name, headline and every education entry of an open profile in one call.
+# Each education <li> yields its visible spans: [school, degree, dates].
+PROFILE_JS = """
+const spans = li => Array.from(li.querySelectorAll("span[aria-hidden='true']"))
+  .filter(s => s.closest('li') === li)
+  .map(s => s.innerText.trim()).filter(Boolean);
+const anchor = document.getElementById('education');
+const sec = anchor && anchor.closest('section');
+const h1 = document.querySelector('h1');
+return {
+  name: h1 ? h1.innerText.trim() : '',
+  headline: (document.querySelector('div.text-body-medium.break-words') || {innerText: ''}).innerText.trim(),
+  education: sec ? Array.from(sec.querySelectorAll('li'))
+                     .filter(li => !li.parentElement.closest('li'))
+                     .map(spans).filter(s => s.length) : null,
+};
+"""
+EDUCATION_WAIT = 3   # seconds to wait for the lazily rendered education section
+
+# Every profile link href on a results page in one round-trip (CSS selectors only)
+PROFILE_URLS_JS = """
+return Array.from(document.querySelectorAll(arguments[0].join(','))).map(a => a.href);
+"""
+RESULTS_CSS = [s for s in LINKEDIN_SELECTORS["search_results"] if not s.startswith("//")]
+PROFILE_LINK_CSS = [s for s in LINKEDIN_SELECTORS["profile_links"] if not s.startswith("//")]
+
+
+CSV_FIELDS = ['name', 'url', 'title', 'company', 'institution', 'degree', 'date_range']
+
+
+def csv_rows(profile):
+    """Flatten one profile into CSV rows – one per relevant education entry."""
+    for edu in profile['education']:
+        yield {
+            'name': profile['name'],
+            'url': profile['url'],
+            'title': profile['title'],
+            'company': profile['company'],
+            'institution': edu['institution'],
+            'degree': edu['degree'],
+            'date_range': edu['date_range']
+        }
+
+
+def profile_key(profile_url):
+    """Cache key for a profile URL (PROFILE_CACHE is already per target list)."""
+    return hashlib.sha1(profile_url.encode()).hexdigest()
+
 class AlumniScraper:
     def __init__(self, email, password, chrome_driver_path=None):
         self.email = email
@@ -48,22 +118,40 @@ class AlumniScraper:
         self.chrome_driver_path = chrome_driver_path or BROWSER_SETTINGS["chrome_driver_path"]
         self.driver = None
         self.alumni_data = []
+        self._cache = None          # shelve of processed profiles, opened in run()
+        self._seen = set()          # keys already handled in this run
         
     def initialize_driver(self):
         """Initialize the Chrome driver."""
         try:
+            opts = Options()
+            if HEADLESS:
+                # Person(...) only reads the DOM – no window or GPU compositor needed
+                opts.add_argument("--headless=new")
+                opts.add_argument("--window-size=1920,1080")
+                opts.add_argument("--disable-gpu")
+                opts.add_argument("--disable-dev-shm-usage")
+            # Images are never looked at here, so never download or decode them
+            opts.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            opts.add_argument("--blink-settings=imagesEnabled=false")
+            opts.page_load_strategy = "eager"
+            
             # For Selenium 4, use Service class
             if self.chrome_driver_path and os.path.exists(self.chrome_driver_path):
                 logging.info(f"Using ChromeDriver from: {self.chrome_driver_path}")
                 service = Service(self.chrome_driver_path)
-                self.driver = webdriver.Chrome(service=service)
+                self.driver = webdriver.Chrome(service=service, options=opts)
             else:
                 # Use webdriver_manager to automatically download and manage ChromeDriver
                 logging.info("Using webdriver_manager to handle ChromeDriver")
                 service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service)
+                self.driver = webdriver.Chrome(service=service, options=opts)
             
-            self.driver.maximize_window()
+            if not HEADLESS:
+                self.driver.maximize_window()
             logging.info("ChromeDriver initialized successfully")
             return True
         except Exception as e:
@@ -132,18 +220,17 @@ class AlumniScraper:
         try:
             # Wait for search results to load
             WebDriverWait(self.driver, SEARCH_SETTINGS["timeout_wait"]).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, LINKEDIN_SELECTORS["search_results"]))
+                EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(RESULTS_CSS)))
             )
             
-            # Collect profile links
-            profile_elements = self.driver.find_elements(By.CSS_SELECTOR, LINKEDIN_SELECTORS["profile_links"])
-            
-            for i, element in enumerate(profile_elements):
-                if i >= limit:
+            # Collect profile links – all hrefs in one script call instead of one per element
+            for url in self.driver.execute_script(PROFILE_URLS_JS, PROFILE_LINK_CSS) or []:
+                if len(profile_urls) >= limit:
                     break
-                url = element.get_attribute('href')
                 if url and 'linkedin.com/in/' in url:
-                    profile_urls.append(url.split('?')[0])  # Remove query parameters
+                    url = url.split('?')[0]  # Remove query parameters
+                    if url not in profile_urls:
+                        profile_urls.append(url)
             
             logging.info(f"Collected {len(profile_urls)} profile URLs")
             return profile_urls
@@ -153,81 +240,107 @@ class AlumniScraper:
     
     def process_profile(self, profile_url):
         """Process a single profile to extract education details."""
+        key = profile_key(profile_url)
+        if key in self._seen:
+            logging.info(f"Already processed in this run: {profile_url}")
+            return False
+        self._seen.add(key)
+        cached = self._cache.get(key) if self._cache is not None else None
+        if cached and time.time() - cached[0] < PROFILE_CACHE_TTL:
+            logging.info(f"Cache hit for {profile_url}")
+            self.alumni_data.append(cached[1])
+            return True
+
         try:
-            person = Person(profile_url, driver=self.driver, close_on_complete=False)
+            # Fast path: one page load + one script; full linkedin_scraper run only as fallback
+            person = self.read_profile_dom(profile_url) or self.read_profile_person(profile_url)
             
             # Check if this person has any of the target institutions in their education
             relevant_education = []
-            for edu in person.educations:
-                school = edu.institution if hasattr(edu, 'institution') else ""
-                
+            for edu in person['educations']:
                 # Check if any target institution is in the school name
-                for target in TARGET_INSTITUTIONS:
-                    if target.lower() in school.lower():
-                        relevant_education.append({
-                            'institution': school,
-                            'degree': edu.degree if hasattr(edu, 'degree') else "",
-                            'date_range': edu.date_range if hasattr(edu, 'date_range') else ""
-                        })
-                        break
+                if matches_target(edu['institution']):
+                    relevant_education.append(edu)
             
             if relevant_education:
                 # Collect general profile data
                 profile_data = {
-                    'name': person.name,
+                    'name': person['name'],
                     'url': profile_url,
-                    'title': person.job_title,
-                    'company': person.company,
+                    'title': person['title'],
+                    'company': person['company'],
                     'education': relevant_education
                 }
                 
                 self.alumni_data.append(profile_data)
-                logging.info(f"Found relevant education for {person.name}")
+                self._remember(key, profile_data)
+                logging.info(f"Found relevant education for {person['name']}")
                 return True
             
-            logging.info(f"No relevant education found for {person.name}")
+            logging.info(f"No relevant education found for {person['name']}")
             return False
         except Exception as e:
             logging.error(f"Error processing profile {profile_url}: {e}")
             return False
     
-    def export_to_csv(self, filename=None):
-        """Export the collected alumni data to CSV."""
+    def read_profile_dom(self, profile_url):
+        """Read name, title, company and education straight from the profile DOM.
+        
+        Returns None when the education section cannot be found, so the caller
+        can fall back to :meth:`read_profile_person`.
+        """
+        self.driver.get(profile_url)
+        WebDriverWait(self.driver, SEARCH_SETTINGS["timeout_wait"]).until(
+            EC.presence_of_element_located((By.TAG_NAME, "h1"))
+        )
+        # The education section renders once it is scrolled towards
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         try:
-            if not self.alumni_data:
-                logging.warning("No alumni data to export")
-                return False
-            
-            filename = filename or OUTPUT_SETTINGS["csv_filename"]
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as file:
-                # Create a flat structure for CSV
-                fieldnames = ['name', 'url', 'title', 'company', 'institution', 'degree', 'date_range']
-                writer = csv.DictWriter(file, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for profile in self.alumni_data:
-                    for edu in profile['education']:
-                        row = {
-                            'name': profile['name'],
-                            'url': profile['url'],
-                            'title': profile['title'],
-                            'company': profile['company'],
-                            'institution': edu['institution'],
-                            'degree': edu['degree'],
-                            'date_range': edu['date_range']
-                        }
-                        writer.writerow(row)
-            
-            # Also save the raw data to JSON for complete record
-            with open(filename.replace('.csv', '.json'), 'w', encoding='utf-8') as json_file:
-                json.dump(self.alumni_data, json_file, indent=2)
-            
-            logging.info(f"Exported {len(self.alumni_data)} alumni profiles to {filename}")
-            return True
-        except Exception as e:
-            logging.error(f"Error exporting to CSV: {e}")
-            return False
+            WebDriverWait(self.driver, EDUCATION_WAIT).until(
+                EC.presence_of_element_located((By.ID, "education"))
+            )
+        except Exception:
+            return None
+        
+        raw = self.driver.execute_script(PROFILE_JS) or {}
+        if not raw.get('name') or raw.get('education') is None:
+            return None
+        title, _, company = raw.get('headline', '').partition(' at ')
+        return {
+            'name': raw['name'],
+            'title': title.strip(),
+            'company': company.strip(),
+            'educations': [
+                {
+                    'institution': spans[0],
+                    'degree': spans[1] if len(spans) > 1 else "",
+                    'date_range': spans[2] if len(spans) > 2 else ""
+                }
+                for spans in raw['education']
+            ]
+        }
+    
+    def read_profile_person(self, profile_url):
+        """Full linkedin_scraper ``Person`` scrape – slower, but copes with other layouts."""
+        person = Person(profile_url, driver=self.driver, close_on_complete=False)
+        return {
+            'name': person.name,
+            'title': person.job_title,
+            'company': person.company,
+            'educations': [
+                {
+                    'institution': getattr(edu, 'institution', "") or "",
+                    'degree': getattr(edu, 'degree', "") or "",
+                    'date_range': getattr(edu, 'date_range', "") or ""
+                }
+                for edu in person.educations
+            ]
+        }
+    
+    def _remember(self, key, profile_data):
+        """Store an accepted profile in the cache, stamped for PROFILE_CACHE_TTL."""
+        if self._cache is not None:
+            self._cache[key] = (time.time(), profile_data)
     
     def run(self, profiles_per_institution=None):
         """Run the complete alumni search process."""
@@ -236,6 +349,11 @@ class AlumniScraper:
         if not self.initialize_driver():
             return False
         
+        PROFILE_CACHE.parent.mkdir(exist_ok=True)
+        self._cache = shelve.open(str(PROFILE_CACHE))
+        
+        csv_path = OUTPUT_SETTINGS["csv_filename"]
+        ndjson_path = csv_path.replace('.csv', '.ndjson')   # raw record, one profile per line
         try:
             if not self.login():
                 return False
@@ -243,25 +361,38 @@ class AlumniScraper:
             # Allow some time after login
             time.sleep(5)
             
-            for institution in TARGET_INSTITUTIONS:
-                logging.info(f"Searching for alumni of: {institution}")
-                
-                if not self.search_for_institution(institution):
-                    continue
-                
-                profile_urls = self.collect_profile_urls(limit=profiles_per_institution)
+            # Rows are written as each profile completes, so a crash mid-run keeps them
+            with open(csv_path, 'w', newline='', encoding='utf-8') as csv_file, \
+                 open(ndjson_path, 'w', encoding='utf-8') as ndjson_file:
+                writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
+                writer.writeheader()
                 
-                for url in profile_urls:
-                    self.process_profile(url)
-                    # Be nice to LinkedIn's servers
-                    time.sleep(SEARCH_SETTINGS["delay_between_profiles"])
+                for institution in TARGET_INSTITUTIONS:
+                    logging.info(f"Searching for alumni of: {institution}")
+                    
+                    if not self.search_for_institution(institution):
+                        continue
+                    
+                    profile_urls = self.collect_profile_urls(limit=profiles_per_institution)
+                    
+                    for url in profile_urls:
+                        if self.process_profile(url):
+                            writer.writerows(csv_rows(self.alumni_data[-1]))
+                            ndjson_file.write(json.dumps(self.alumni_data[-1]) + "\n")
+                            csv_file.flush()
+                            ndjson_file.flush()
+                        # Be nice to LinkedIn's servers
+                        time.sleep(SEARCH_SETTINGS["delay_between_profiles"])
             
-            self.export_to_csv()
+            logging.info(f"Exported {len(self.alumni_data)} alumni profiles to {csv_path}")
             return True
         except Exception as e:
             logging.error(f"Error in run process: {e}")
             return False
         finally:
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
             if self.driver:
                 self.driver.quit()
 